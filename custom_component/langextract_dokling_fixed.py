@@ -20,6 +20,27 @@ from langflow.io import DropdownInput, HandleInput, BoolInput, FloatInput, IntIn
 from langflow.schema import Data, DataFrame
 
 
+def _create_session() -> requests.Session:
+    """Create a pooled requests session with retry logic."""
+    session = requests.Session()
+    
+    # Configure retry strategy
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    
+    adapter = HTTPAdapter(pool_connections=50, pool_maxsize=100, max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every client so repeated calls reuse pooled keep-alive connections
+_SESSION = _create_session()
+
+
 @dataclass
 class DocumentChunk:
     """Represents a document chunk for processing."""
@@ -261,22 +282,9 @@ class LangExtractComponent(Component):
             raise ValueError(f"Failed to extract chunks from Dokling data: {e}")
     
     def _create_client(self, api_url: str, timeout: int):
-        """Create a requests session with retry logic."""
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
+        """Create a client backed by the shared requests session."""
         return {
-            'session': session,
+            'session': _SESSION,
             'base_url': api_url.rstrip('/'),
             'timeout': timeout
         }
@@ -330,21 +338,8 @@ class LangExtractComponent(Component):
 # Utility functions for standalone use
 def create_langextract_component(api_url: str = "https://langextract.ai-did-it.eu") -> Dict[str, Any]:
     """Factory function to create a LangExtract client instance."""
-    session = requests.Session()
-    
-    # Configure retry strategy
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
     return {
-        'session': session,
+        'session': _SESSION,
         'base_url': api_url.rstrip('/'),
         'timeout': 30
     }
@@ -14,6 +14,7 @@ API Endpoints:
 
 import os
 import json
+import time
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -23,8 +24,9 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import openai
-import psycopg2
+from psycopg2.extensions import connection as PgConnection
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 import uvicorn
 
 # Configure logging
@@ -57,6 +59,12 @@ DB_NAME = os.getenv("DB_NAME", "langextract")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 
+# Connection pool - Supabase caps backend connections, so each process keeps a
+# bounded set open and recycles them after DB_POOL_MAX_LIFETIME seconds
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", str((os.cpu_count() or 4) * 2 + 1)))
+DB_POOL_MAX_LIFETIME = int(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+
 # Validate required environment variables
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY environment variable is required")
@@ -98,21 +106,67 @@ class StatsResponse(BaseModel):
     oldest_embedding: Optional[datetime]
 
 # Database connection
-def get_db_connection():
-    """Get database connection."""
-    try:
-        conn = psycopg2.connect(
+_db_pool = None
+
+
+class PooledConnection(PgConnection):
+    """Connection that remembers when it was opened and which statements it has prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened_at = time.monotonic()
+        self.search_prepared = False
+
+# Similarity search runs on every chat turn; it is prepared once per pooled
+# connection so Postgres skips parse and plan on later calls
+SEARCH_STATEMENT = "search_similar_documents"
+SEARCH_STATEMENT_SQL = f"""
+    PREPARE {SEARCH_STATEMENT} (vector(1536), float, int) AS
+    SELECT 
+        id,
+        chunk_id,
+        document_id,
+        content,
+        similarity
+    FROM match_documents($1, $2, $3)
+"""
+
+def _get_db_pool() -> ThreadedConnectionPool:
+    """Create the connection pool on first use."""
+    global _db_pool
+    if _db_pool is None:
+        _db_pool = ThreadedConnectionPool(
+            DB_POOL_MIN,
+            DB_POOL_MAX,
             host=DB_HOST,
             port=DB_PORT,
             database=DB_NAME,
             user=DB_USER,
-            password=DB_PASSWORD
+            password=DB_PASSWORD,
+            connection_factory=PooledConnection
         )
-        return conn
+    return _db_pool
+
+def get_db_connection():
+    """Get a database connection from the pool; hand it back with release_db_connection()."""
+    try:
+        return _get_db_pool().getconn()
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise HTTPException(status_code=500, detail="Database connection failed")
 
+def release_db_connection(conn):
+    """Return a connection to the pool, closing it if it is broken or past its lifetime."""
+    close = time.monotonic() - conn.opened_at > DB_POOL_MAX_LIFETIME
+    if not conn.closed:
+        try:
+            # End the open transaction so pooled connections are not left idle in transaction
+            conn.rollback()
+        except Exception:
+            close = True
+    close = close or bool(conn.closed)
+    _get_db_pool().putconn(conn, close=close)
+
 # Utility functions
 def generate_embedding(text: str) -> List[float]:
     """Generate embedding for text using OpenAI."""
@@ -141,19 +195,13 @@ def search_similar_documents(
         embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
         
         # Search using the match_documents function
-        cursor.execute("""
-            SELECT 
-                id,
-                chunk_id,
-                document_id,
-                content,
-                similarity
-            FROM match_documents(
-                %s::vector(1536),
-                %s,
-                %s
-            )
-        """, (embedding_str, similarity_threshold, max_results))
+        if not conn.search_prepared:
+            cursor.execute(SEARCH_STATEMENT_SQL)
+            conn.search_prepared = True
+        cursor.execute(
+            f"EXECUTE {SEARCH_STATEMENT} (%s, %s, %s)",
+            (embedding_str, similarity_threshold, max_results)
+        )
         
         results = cursor.fetchall()
         
@@ -175,7 +223,7 @@ def search_similar_documents(
         raise HTTPException(status_code=500, detail="Database search failed")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def generate_chat_response(
     user_message: str,
@@ -247,15 +295,18 @@ async def health_check():
         # Check database connection
         database_connected = False
         total_embeddings = 0
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM embeddings")
             total_embeddings = cursor.fetchone()[0]
             database_connected = True
-            conn.close()
         except:
             pass
+        finally:
+            if conn:
+                release_db_connection(conn)
         
         return HealthResponse(
             status="healthy" if openai_connected and database_connected else "unhealthy",
@@ -313,7 +364,7 @@ async def get_stats():
         raise HTTPException(status_code=500, detail="Failed to get statistics")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat_with_documents(chat_message: ChatMessage):
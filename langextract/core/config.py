@@ -0,0 +1,39 @@
+"""
+Typed configuration parsed from the environment once per process.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from .env import env
+
+
+def _env_bool(key: str, default: str = 'False') -> bool:
+    return env(key, default).lower() == 'true'
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Environment-derived settings whose values need splitting or casting."""
+    secret_key: str
+    debug: bool
+    allowed_hosts: Tuple[str, ...]
+    openai_api_key: Optional[str]
+    openai_model: str
+    max_tokens_per_request: int
+    cors_allow_all_origins: bool
+
+    @classmethod
+    def from_env(cls) -> 'Config':
+        """Build the configuration from environment variables and the .env file."""
+        return cls(
+            secret_key=env('DJANGO_SECRET_KEY', 'django-insecure-change-me-in-production'),
+            debug=_env_bool('DEBUG'),
+            allowed_hosts=tuple(env('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')),
+            openai_api_key=env('OPENAI_API_KEY'),
+            openai_model=env('OPENAI_MODEL', 'text-embedding-3-small'),
+            max_tokens_per_request=int(env('MAX_TOKENS_PER_REQUEST', '8000')),
+            cors_allow_all_origins=_env_bool('CORS_ALLOW_ALL_ORIGINS'),
+        )
+
+
+CONFIG = Config.from_env()
@@ -0,0 +1,23 @@
+"""
+Environment variable loading shared by the settings modules and clients.
+"""
+
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+_LOADED = False
+
+
+def load_env():
+    """Load the .env file into os.environ, once per process."""
+    global _LOADED
+    if not _LOADED:
+        load_dotenv()
+        _LOADED = True
+
+
+def env(key: str, default: Optional[str] = None) -> Optional[str]:
+    """Get an environment variable, loading the .env file first if needed."""
+    load_env()
+    return os.getenv(key, default)
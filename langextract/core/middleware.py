@@ -1,22 +1,41 @@
 """
-Minimal middleware for stateless API service.
+Middleware for the stateless API service.
 """
 
-class StatelessMiddleware:
-    """Minimal middleware that doesn't depend on Django's auth system."""
+import zlib
+from django.conf import settings
+from django.http import JsonResponse
+
+
+class GzipRequestMiddleware:
+    """Decompress request bodies sent with Content-Encoding: gzip."""
     
     def __init__(self, get_response):
         self.get_response = get_response
     
     def __call__(self, request):
-        # Add any custom processing here if needed
-        response = self.get_response(request)
-        return response
-    
-    def process_request(self, request):
-        # Process request if needed
-        pass
+        if request.META.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip':
+            error = self._decompress_body(request)
+            if error:
+                return error
+        return self.get_response(request)
     
-    def process_response(self, request, response):
-        # Process response if needed
-        return response
+    @staticmethod
+    def _decompress_body(request):
+        """Replace the request body with its decompressed bytes, or return an error response."""
+        max_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(request.body, max_size + 1 if max_size else 0)
+        except zlib.error:
+            return JsonResponse({'error': 'Invalid gzip request body'}, status=400)
+        
+        if max_size and len(body) > max_size:
+            return JsonResponse({'error': 'Request body too large'}, status=413)
+        if not decompressor.eof:
+            return JsonResponse({'error': 'Invalid gzip request body'}, status=400)
+        
+        request._body = body
+        request.META['CONTENT_LENGTH'] = str(len(body))
+        del request.META['HTTP_CONTENT_ENCODING']
+        return None
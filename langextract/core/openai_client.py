@@ -6,10 +6,54 @@ import logging
 import time
 from typing import List, Dict, Any, Optional
 import openai
+import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connection pool shared by every OpenAI API call
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 50
+
+# Connection-level retries, as in the session the openai library builds itself
+HTTP_CONNECTION_RETRIES = 2
+
+# Inputs per embeddings request; the API accepts up to 2048 inputs per call
+EMBEDDING_BATCH_SIZE = 100
+
+# Error code the API returns for an input over the model's context length
+CONTEXT_LENGTH_ERROR_CODE = 'context_length_exceeded'
+
+
+def _is_input_error(error: 'openai.error.InvalidRequestError') -> bool:
+    """Check whether a rejected request was caused by one of its inputs, not by the request itself."""
+    return error.param == 'input' or error.code == CONTEXT_LENGTH_ERROR_CODE
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Create a pooled HTTP session so TLS connections are reused across calls.
+    
+    Mirrors the openai library's own session (connection retries, openai.proxy)
+    apart from the pool sizes. The library closes a thread's session after
+    MAX_SESSION_LIFETIME_SECS; with one shared session that clears the pool for
+    every thread, which only costs a reconnect on each thread's next call.
+    """
+    session = requests.Session()
+    if isinstance(openai.proxy, str):
+        session.proxies = {'http': openai.proxy, 'https': openai.proxy}
+    elif isinstance(openai.proxy, dict):
+        session.proxies = dict(openai.proxy)
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=HTTP_CONNECTION_RETRIES,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 
 class OpenAIClient:
     """Handles OpenAI API interactions for embedding generation."""
@@ -26,6 +70,8 @@ class OpenAIClient:
             try:
                 # Set the API key for the older openai library
                 openai.api_key = self.api_key
+                # Share one keep-alive session instead of the library's per-thread sessions
+                openai.requestssession = _create_http_session()
                 self.client = openai
                 logger.info("OpenAI client initialized successfully")
             except Exception as e:
@@ -69,20 +115,63 @@ class OpenAIClient:
         """
         Generate embeddings for multiple texts in a batch.
         
+        Texts are sent EMBEDDING_BATCH_SIZE at a time, one API request per batch.
+        
         Args:
             texts: List of texts to embed
             
         Returns:
             List of embeddings (None for failed embeddings)
         """
-        embeddings = []
+        if not self.client:
+            logger.warning("OpenAI client not available - cannot generate embeddings")
+            return [None] * len(texts)
         
-        for text in texts:
-            embedding = self.generate_embedding(text)
-            embeddings.append(embedding)
+        embeddings = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            embeddings.extend(self._embed_batch(texts[start:start + EMBEDDING_BATCH_SIZE]))
         
         return embeddings
     
+    def _embed_batch(self, batch: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed a batch of texts in one API request.
+        
+        A rejected input (too long, refused content) fails the whole request, so the
+        batch is split in half and retried until only the offending texts get None.
+        Requests rejected for any other reason (unknown model, bad parameter) would
+        fail the same way for every half, so the whole batch gets None at once.
+        """
+        try:
+            # Add delay for rate limiting
+            time.sleep(self.rate_limit_delay)
+            
+            response = self.client.Embedding.create(
+                model=self.model,
+                input=batch
+            )
+            
+        except openai.error.InvalidRequestError as e:
+            if not _is_input_error(e):
+                logger.error(f"Error generating embeddings batch: {e}")
+                return [None] * len(batch)
+            if len(batch) == 1:
+                logger.error(f"Error generating embedding: {e}")
+                return [None]
+            middle = len(batch) // 2
+            return self._embed_batch(batch[:middle]) + self._embed_batch(batch[middle:])
+        
+        except Exception as e:
+            logger.error(f"Error generating embeddings batch: {e}")
+            return [None] * len(batch)
+        
+        # Results carry the index of their input; place them accordingly
+        batch_embeddings = [None] * len(batch)
+        for item in response['data']:
+            batch_embeddings[item['index']] = item['embedding']
+        logger.debug(f"Generated {len(batch)} embeddings in one request")
+        return batch_embeddings
+    
     def validate_text_length(self, text: str) -> bool:
         """
         Validate that text length is within OpenAI's token limits.
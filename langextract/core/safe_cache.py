@@ -0,0 +1,45 @@
+"""
+Cache access for caches that only save work.
+
+A cache backend error (e.g. Redis being unreachable) is logged and treated as a
+miss, so an outage slows requests down instead of failing them.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def _call(operation: str, default: Any, *args, **kwargs) -> Any:
+    try:
+        return getattr(cache, operation)(*args, **kwargs)
+    except Exception as e:
+        logger.warning(f"Cache {operation} failed, continuing without the cache: {e}")
+        return default
+
+
+def cache_get(key: str, **kwargs) -> Any:
+    """Get a cached value, or None if it is missing or the cache failed."""
+    return _call('get', None, key, **kwargs)
+
+
+def cache_get_many(keys: Iterable[str], **kwargs) -> Dict[str, Any]:
+    """Get the cached values for keys; a cache failure returns no values."""
+    return _call('get_many', {}, keys, **kwargs)
+
+
+def cache_set(key: str, value: Any, timeout: Optional[int], **kwargs):
+    """Cache a value (forever if timeout is None), ignoring cache failures."""
+    _call('set', None, key, value, timeout, **kwargs)
+
+
+def cache_set_many(data: Dict[str, Any], timeout: int, **kwargs):
+    """Cache several values, ignoring cache failures."""
+    _call('set_many', None, data, timeout, **kwargs)
+
+
+def cache_delete(key: str, **kwargs):
+    """Delete a cached value, ignoring cache failures."""
+    _call('delete', None, key, **kwargs)
@@ -2,16 +2,22 @@
 Supabase client for vector database operations.
 """
 
-import os
+import time
+import random
 import logging
 from typing import Dict, List, Any, Optional
 from supabase import create_client, Client
-from dotenv import load_dotenv
+from .env import env, load_env
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
-load_dotenv()
+load_env()
+
+# Table columns are cached per process for about ten minutes; the jitter keeps
+# processes that started together from refreshing at the same moment
+SCHEMA_CACHE_TTL = 540
+SCHEMA_CACHE_JITTER = 60
 
 
 class SupabaseClient:
@@ -24,15 +30,17 @@ class SupabaseClient:
         self.service_role_key = None
         self._client = None
         self._initialized = False
+        # Column names by table name, as (expiry time, columns)
+        self._table_columns = {}
     
     def _initialize(self):
         """Initialize the Supabase client if not already done."""
         if self._initialized:
             return
         
-        self.url = os.getenv('SUPABASE_URL')
-        self.anon_key = os.getenv('SUPABASE_ANON_KEY')
-        self.service_role_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        self.url = env('SUPABASE_URL')
+        self.anon_key = env('SUPABASE_ANON_KEY')
+        self.service_role_key = env('SUPABASE_SERVICE_ROLE_KEY')
         
         if not self.url or not self.anon_key:
             logger.warning("SUPABASE_URL and SUPABASE_ANON_KEY not set - vector storage will not work")
@@ -76,6 +84,25 @@ class SupabaseClient:
             raise RuntimeError("Supabase client not initialized. Check your environment variables.")
         return self._client
     
+    def get_table_columns(self, table_name: str) -> frozenset:
+        """
+        Get the column names of a public table (empty if the table does not exist).
+        
+        Uses the get_table_columns database function from db/migrations/007, and caches
+        the result for SCHEMA_CACHE_TTL seconds plus jitter.
+        """
+        now = time.monotonic()
+        cached = self._table_columns.get(table_name)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        response = self.get_client().rpc('get_table_columns', {'table_name': table_name}).execute()
+        columns = frozenset(response.data or ())
+        
+        expires_at = now + SCHEMA_CACHE_TTL + random.uniform(0, SCHEMA_CACHE_JITTER)
+        self._table_columns[table_name] = (expires_at, columns)
+        return columns
+    
     def is_available(self) -> bool:
         """Check if Supabase client is available and configured."""
         try:
@@ -99,5 +126,7 @@ except Exception as e:
             raise RuntimeError("Supabase client not available")
         def test_connection(self):
             return False
+        def get_table_columns(self, table_name):
+            raise RuntimeError("Supabase client not available")
     
     supabase_client = DummySupabaseClient()
@@ -30,7 +30,7 @@ CREATE TABLE IF NOT EXISTS langextract_processed_embeddings (
     content TEXT NOT NULL,
     content_type VARCHAR(50) DEFAULT 'text', -- text, table, image, etc.
     embedding vector(1536), -- OpenAI text-embedding-3-small dimension
-    all_embeddings JSONB, -- Store all embeddings (text, schemas, key_phrases)
+    all_embeddings JSONB, -- Embeddings other than the text one, which is only in embedding; NULL if none
     extracted_metadata JSONB, -- Store extracted structured data from langextract
     chunk_metadata JSONB, -- Store chunk-specific metadata (page, position, etc.)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -196,6 +196,7 @@ COMMENT ON COLUMN langextract_documents.processing_status IS 'Status of document
 COMMENT ON COLUMN langextract_processed_embeddings.chunk_index IS 'Order of this chunk within the document (0-based)';
 COMMENT ON COLUMN langextract_processed_embeddings.content_type IS 'Type of content: text, table, image, header, etc.';
 COMMENT ON COLUMN langextract_processed_embeddings.embedding IS 'Primary embedding vector for similarity search';
+COMMENT ON COLUMN langextract_processed_embeddings.all_embeddings IS 'Additional embeddings keyed by kind, excluding the text embedding stored in embedding; NULL when there are none';
 COMMENT ON COLUMN langextract_processed_embeddings.extracted_metadata IS 'Structured data extracted using langextract schemas';
 COMMENT ON COLUMN langextract_processed_embeddings.chunk_metadata IS 'Chunk-specific metadata like page number, position, etc.';
 
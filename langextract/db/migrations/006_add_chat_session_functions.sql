@@ -0,0 +1,21 @@
+-- Migration: Add chat session helper functions
+-- Lets the API delete a chat session and its messages in a single round-trip
+
+-- Delete a chat session and all its messages in one transaction
+CREATE OR REPLACE FUNCTION delete_langextract_chat_session(sid UUID)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    DELETE FROM langextract_chat_messages WHERE session_id = sid;
+    
+    DELETE FROM langextract_chat_sessions WHERE id = sid;
+    
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$;
+
+COMMENT ON FUNCTION delete_langextract_chat_session(UUID) IS 'Delete a chat session and its messages; returns the number of sessions deleted';
@@ -0,0 +1,17 @@
+-- Migration: Add table column introspection function
+-- Lets maintenance scripts read a table's columns in a single round-trip
+
+-- Return the column names of a table in the public schema
+CREATE OR REPLACE FUNCTION get_table_columns(table_name TEXT)
+RETURNS SETOF TEXT
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.column_name::TEXT
+    FROM information_schema.columns c
+    WHERE c.table_schema = 'public'
+      AND c.table_name = get_table_columns.table_name
+    ORDER BY c.ordinal_position;
+$$;
+
+COMMENT ON FUNCTION get_table_columns(TEXT) IS 'List the column names of a public table; returns no rows if the table does not exist';
@@ -0,0 +1,5 @@
+-- Migration: Document the all_embeddings column of processed chunks
+-- The text embedding is stored only in the embedding column; all_embeddings holds
+-- any other embeddings and is NULL when there are none
+
+COMMENT ON COLUMN langextract_processed_embeddings.all_embeddings IS 'Additional embeddings keyed by kind, excluding the text embedding stored in embedding; NULL when there are none';
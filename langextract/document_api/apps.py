@@ -2,8 +2,21 @@
 Document API app configuration.
 """
 
+import asyncio
+import logging
+
 from django.apps import AppConfig
 
+# Optional imports with fallbacks
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
 
 class DocumentApiConfig(AppConfig):
     """Document API app configuration."""
@@ -11,3 +24,9 @@ class DocumentApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'document_api'
     verbose_name = 'Document API'
+    
+    def ready(self):
+        """Use uvloop for the event loops the document views create, when installed."""
+        if UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop policy")
@@ -19,7 +19,7 @@ from django.views.decorators.http import require_http_methods
 from django.shortcuts import render
 
 from .serializers import (
-    DocumentUploadSerializer, DocumentSerializer, DocumentStatusSerializer,
+    DocumentUploadSerializer, DocumentStatusSerializer,
     ChunkSerializer, DocumentDetailSerializer, ChatSessionSerializer,
     ChatMessageSerializer, ChatRequestSerializer, ChatResponseSerializer,
     SearchRequestSerializer, SearchResultSerializer, DocumentStatsSerializer,
@@ -31,6 +31,24 @@ from core.openai_client import openai_client
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by list_chat_sessions; matches the fields of ChatSessionSerializer
+# so the rows can be returned to clients as-is.
+CHAT_SESSION_LIST_COLUMNS = 'id, user_id, session_name, document_ids, created_at, updated_at, last_activity'
+
+
+def _truncate(text: str, max_length: int = 200) -> str:
+    """Truncate text to max_length characters, adding an ellipsis when cut."""
+    return text if len(text) <= max_length else text[:max_length] + '...'
+
+
+def _stringify_ids(ids: Optional[List[Any]]) -> Optional[List[str]]:
+    """Return ids as a list of strings, reusing the list when it already holds strings."""
+    if not ids:
+        return None
+    if isinstance(ids[0], str):
+        return ids
+    return [str(doc_id) for doc_id in ids]
+
 
 class DocumentAPIView:
     """API view for document operations."""
@@ -58,8 +76,7 @@ class DocumentAPIView:
             enable_docling = serializer.validated_data.get('enable_docling', True)  # Default to True
             processing_options = serializer.validated_data.get('processing_options', {})
             
-            # Read file data
-            file_data = file.read()
+            # Pass the uploaded file through so it is streamed to disk, not read into memory
             filename = file.name
             
             # Process document asynchronously
@@ -69,7 +86,7 @@ class DocumentAPIView:
             try:
                 result = loop.run_until_complete(
                     DocumentAPIView().processor.process_document(
-                        file_data, filename, str(user_id), schemas, 
+                        file, filename, str(user_id), schemas, 
                         enable_docling=enable_docling, 
                         processing_options=processing_options
                     )
@@ -108,11 +125,10 @@ class DocumentAPIView:
                     DocumentAPIView().processor.list_documents(limit, offset)
                 )
                 
-                serializer = DocumentSerializer(documents, many=True)
-                
+                # Rows are already projected to the DocumentSerializer fields
                 return Response({
                     'success': True,
-                    'data': serializer.data,
+                    'data': documents,
                     'count': len(documents)
                 })
                 
@@ -299,8 +315,9 @@ class DocumentAPIView:
                 'match_count': limit
             }
             
-            if document_ids:
-                search_params['document_ids'] = [str(doc_id) for doc_id in document_ids]
+            doc_id_strs = _stringify_ids(document_ids)
+            if doc_id_strs:
+                search_params['document_ids'] = doc_id_strs
             
             if content_type_filter:
                 search_params['content_type_filter'] = content_type_filter
@@ -464,14 +481,14 @@ class ChatAPIView:
                 }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             
             client = supabase_client.get_client()
-            response = client.table('langextract_chat_sessions').select('*').order('last_activity', desc=True).execute()
+            response = client.table('langextract_chat_sessions').select(CHAT_SESSION_LIST_COLUMNS).order('last_activity', desc=True).execute()
             
+            # Rows are already projected to the ChatSessionSerializer fields
             sessions = response.data or []
-            serializer = ChatSessionSerializer(sessions, many=True)
             
             return Response({
                 'success': True,
-                'data': serializer.data,
+                'data': sessions,
                 'count': len(sessions)
             })
             
@@ -495,20 +512,21 @@ class ChatAPIView:
             
             client = supabase_client.get_client()
             
-            # Get session
-            session_response = client.table('langextract_chat_sessions').select('*').eq('id', session_id).execute()
+            # Get session with its messages embedded in a single request
+            session_response = (
+                client.table('langextract_chat_sessions')
+                .select('*, messages:langextract_chat_messages(*)')
+                .eq('id', session_id)
+                .order('created_at', foreign_table='messages')
+                .execute()
+            )
             if not session_response.data:
                 return Response({
                     'error': 'Chat session not found'
                 }, status=status.HTTP_404_NOT_FOUND)
             
             session = session_response.data[0]
-            
-            # Get messages
-            messages_response = client.table('langextract_chat_messages').select('*').eq('session_id', session_id).order('created_at').execute()
-            messages = messages_response.data or []
-            
-            session['messages'] = messages
+            messages = session.get('messages') or []
             
             session_serializer = ChatSessionSerializer(session)
             messages_serializer = ChatMessageSerializer(messages, many=True)
@@ -575,18 +593,6 @@ class ChatAPIView:
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    @staticmethod
-    def _convert_uuids_to_strings(obj):
-        """Recursively convert UUID objects to strings in nested data structures."""
-        if hasattr(obj, '__class__') and 'UUID' in str(obj.__class__):
-            return str(obj)
-        elif isinstance(obj, dict):
-            return {key: ChatAPIView._convert_uuids_to_strings(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [ChatAPIView._convert_uuids_to_strings(item) for item in obj]
-        else:
-            return obj
-    
     @staticmethod
     async def _process_chat_message(message: str, user_id: str, document_ids: List[str], 
                                   include_sources: bool, max_tokens: int = 500, temperature: float = 0.3) -> Dict[str, Any]:
@@ -610,21 +616,13 @@ class ChatAPIView:
                     search_params = {
                         'query_embedding': query_embedding,
                         'filter_user_id': str(user_id),  # Convert UUID to string
-                        'document_ids': [str(doc_id) for doc_id in document_ids] if document_ids else None,  # Convert UUIDs to strings
+                        'document_ids': _stringify_ids(document_ids),  # Convert UUIDs to strings
                         'match_threshold': 0.3,  # Lower threshold to be more permissive
                         'match_count': 10
                     }
                     
                     search_response = client.rpc('search_langextract_processed_embeddings', search_params).execute()
                     relevant_chunks = search_response.data or []
-                    
-                    # Convert all UUID objects to strings in the chunks data
-                    for chunk in relevant_chunks:
-                        for key, value in chunk.items():
-                            if hasattr(value, '__class__') and 'UUID' in str(value.__class__):
-                                chunk[key] = str(value)
-                            elif key in ['id', 'document_id'] and value:
-                                chunk[key] = str(value)
             
             # Generate AI response
             ai_response = ""
@@ -632,10 +630,12 @@ class ChatAPIView:
             
             if openai_client.is_available() and relevant_chunks:
                 # Prepare context from relevant chunks
-                context = ""
-                for chunk in relevant_chunks[:5]:  # Use top 5 chunks
-                    context += f"\n\nDocument Section {chunk['chunk_index'] + 1}:\n{chunk['content']}"
-                    referenced_chunk_ids.append(str(chunk['id']))
+                top_chunks = relevant_chunks[:5]  # Use top 5 chunks
+                context = "".join([
+                    f"\n\nDocument Section {chunk['chunk_index'] + 1}:\n{chunk['content']}"
+                    for chunk in top_chunks
+                ])
+                referenced_chunk_ids = [str(chunk['id']) for chunk in top_chunks]
                 
                 # Generate response using OpenAI completion
                 prompt = f"""Based on the following document context, please answer the user's question. Be helpful, accurate, and concise. If the context doesn't contain enough information to fully answer the question, please say so.
@@ -660,17 +660,17 @@ Please provide a clear and helpful response based on the document content:"""
                     
             elif relevant_chunks:
                 # If we have chunks but no OpenAI, provide a basic response
-                context = "\n\n".join([chunk['content'][:200] + "..." for chunk in relevant_chunks[:3]])
+                context = "\n\n".join([_truncate(chunk['content']) for chunk in relevant_chunks[:3]])
                 ai_response = f"Based on the document content, I found relevant information: {context}"
                 referenced_chunk_ids = [str(chunk['id']) for chunk in relevant_chunks[:3]]
             else:
                 ai_response = "I couldn't find any relevant information in the documents to answer your question. Please try rephrasing your question or check if the documents contain the information you're looking for."
             
-            # Prepare response with proper UUID serialization
+            # UUIDs are serialized natively by the JSON renderer
             response_data = {
                 'message': ai_response,
-                'user_id': str(user_id),
-                'message_id': str(uuid.uuid4()),
+                'user_id': user_id,
+                'message_id': uuid.uuid4(),
                 'referenced_chunks': referenced_chunk_ids,
                 'sources': [
                     {
@@ -678,7 +678,7 @@ Please provide a clear and helpful response based on the document content:"""
                         'document_id': chunk['document_id'],
                         'chunk_id': chunk['chunk_id'],
                         'chunk_index': chunk['chunk_index'],
-                        'content': chunk['content'][:200] + '...' if len(chunk['content']) > 200 else chunk['content'],
+                        'content': _truncate(chunk['content']),
                         'content_type': chunk['content_type'],
                         'similarity': float(chunk['similarity']) if 'similarity' in chunk else None
                     }
@@ -690,9 +690,6 @@ Please provide a clear and helpful response based on the document content:"""
                 }
             }
             
-            # Convert any remaining UUID objects to strings
-            response_data = ChatAPIView._convert_uuids_to_strings(response_data)
-            
             return response_data
             
         except Exception as e:
@@ -715,11 +712,8 @@ Please provide a clear and helpful response based on the document content:"""
             
             client = supabase_client.get_client()
             
-            # Delete messages first (due to foreign key constraint)
-            client.table('langextract_chat_messages').delete().eq('session_id', session_id).execute()
-            
-            # Delete session
-            response = client.table('langextract_chat_sessions').delete().eq('id', session_id).execute()
+            # Delete session and messages in a single transaction
+            response = client.rpc('delete_langextract_chat_session', {'sid': str(session_id)}).execute()
             
             if response.data:
                 return Response({
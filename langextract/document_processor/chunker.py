@@ -4,13 +4,114 @@ Document chunker for optimal text splitting and processing.
 
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator
 from dataclasses import dataclass
 import uuid
 
+# Optional linear-time regex engine for the per-chunk scanning patterns
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
 
+def _compile_scan_pattern(pattern: str):
+    """
+    Compile a hot scanning pattern with re2 when available, falling back to re.
+    
+    re2's digit, word, space and word-boundary classes are ASCII-only, so the re
+    fallback is compiled with re.ASCII to match the same text whether or not
+    google-re2 is installed.
+    """
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            logger.debug("re2 cannot compile pattern, using re: %s", pattern)
+    return re.compile(pattern, re.ASCII)
+
+
+def _top_k_unique(pattern, text: str, k: int) -> List[str]:
+    """Return up to k unique matches of pattern in text, in first-seen order, stopping early."""
+    seen = {}
+    for match in pattern.finditer(text):
+        seen[match.group()] = None
+        if len(seen) >= k:
+            break
+    return list(seen)
+
+
+def _sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of the sentences in text, without slicing it."""
+    start = 0
+    for match in _SENTENCE_SPLIT_RE.finditer(text):
+        yield start, match.start()
+        start = match.end()
+    yield start, len(text)
+
+
+def _bucket_sentences(spans: Iterable[Tuple[int, int]], max_size: int) -> List[Tuple[int, int]]:
+    """Greedily group consecutive sentence spans into (start, end) spans of at most max_size."""
+    buckets = []
+    bucket_start = bucket_end = None
+    for start, end in spans:
+        if bucket_start is None:
+            bucket_start = start
+        elif end - bucket_start > max_size:
+            buckets.append((bucket_start, bucket_end))
+            bucket_start = start
+        bucket_end = end
+    if bucket_start is not None:
+        buckets.append((bucket_start, bucket_end))
+    return buckets
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without building the list str.split() returns."""
+    # Every whitespace character except ' ' is non-printable, so cleaned,
+    # single-space separated text can be counted by its spaces
+    if (text.isprintable() and '  ' not in text
+            and text[:1] != ' ' and text[-1:] != ' '):
+        return text.count(' ') + 1 if text else 0
+    return len(text.split())
+
+
+# Control characters removed by _clean_text, as a str.translate deletion table
+_CTRL_TABLE = dict.fromkeys([
+    *range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0)
+])
+
+# Precompiled patterns used on every chunk
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Entities, dates and numbers in one alternation, dispatched by group name.
+# Earlier groups win at a given position, so e.g. the digits of a phone number
+# are not also reported as numbers.
+_METADATA_RE = _compile_scan_pattern('|'.join(f'(?P<{name}>{pattern})' for name, pattern in (
+    ('emails', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ('urls', r'https?://[^\s<>"{}|\\^`\[\]]+'),
+    ('phones', r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'),
+    ('date', r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'),          # MM/DD/YYYY or DD/MM/YYYY
+    ('date_iso', r'\d{4}[/-]\d{1,2}[/-]\d{1,2}'),        # YYYY/MM/DD
+    ('date_text', r'\w+\s+\d{1,2},?\s+\d{4}'),           # Month DD, YYYY
+    ('currency', r'[\$€£¥₹]\s*\d+(?:,\d{3})*(?:\.\d+)?'),  # Currency amounts
+    ('number', r'\d+(?:,\d{3})*(?:\.\d+)?'),              # Numbers with commas
+)))
+_ENTITY_GROUPS = frozenset({'emails', 'urls', 'phones'})
+_DATE_GROUPS = frozenset({'date', 'date_iso', 'date_text'})
+
+# Names overlap with "Month DD, YYYY" dates, so they are scanned separately
+_NAME_RE = _compile_scan_pattern(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+
+# Cheap pre-check: every _METADATA_RE group except emails and URLs needs a digit
+_DIGIT_RE = re.compile(r'\d')
+
+
 @dataclass
 class ChunkConfig:
     """Configuration for document chunking."""
@@ -19,6 +120,19 @@ class ChunkConfig:
     overlap_size: int = 100     # Overlap between chunks
     preserve_sentences: bool = True  # Try to preserve sentence boundaries
     preserve_paragraphs: bool = True  # Try to preserve paragraph boundaries
+    max_chunk_bytes: int = 16 * 1024  # Upper bound on chunk memory, sized to stay L1/L2-cache resident
+    
+    def __post_init__(self):
+        # Cap characters so a chunk fits max_chunk_bytes even at 4 bytes per
+        # character (the widest internal str representation)
+        max_chars = self.max_chunk_bytes // 4
+        if self.max_chunk_size > max_chars:
+            logger.warning("Lowering max_chunk_size from %d to %d to fit max_chunk_bytes %d",
+                           self.max_chunk_size, max_chars, self.max_chunk_bytes)
+            self.max_chunk_size = max_chars
+        if self.max_chunk_size < self.min_chunk_size:
+            raise ValueError(f"max_chunk_size {self.max_chunk_size} is less than "
+                             f"min_chunk_size {self.min_chunk_size}")
 
 
 class DocumentChunker:
@@ -35,9 +149,9 @@ class DocumentChunker:
             config: Chunking configuration
         """
         self.config = config or ChunkConfig()
-        logger.info(f"DocumentChunker initialized with config: {self.config}")
+        logger.info("DocumentChunker initialized with config: %s", self.config)
     
-    async def chunk_content(self, content: Dict[str, Any], document_id: str) -> List[Dict[str, Any]]:
+    def chunk_content(self, content: Dict[str, Any], document_id: str) -> List[Dict[str, Any]]:
         """
         Chunk document content into optimal pieces.
         
@@ -48,37 +162,90 @@ class DocumentChunker:
         Returns:
             List of chunk dictionaries
         """
-        chunks = []
-        
         try:
-            # Process main text content
-            if content.get('text'):
-                text_chunks = await self._chunk_text(content['text'], document_id, 'text')
-                chunks.extend(text_chunks)
-            
-            # Process tables separately
-            if content.get('tables'):
-                for i, table in enumerate(content['tables']):
-                    table_chunks = await self._chunk_table(table, document_id, i)
-                    chunks.extend(table_chunks)
-            
-            # Process images (store as metadata chunks)
-            if content.get('images'):
-                for i, image in enumerate(content['images']):
-                    image_chunk = await self._create_image_chunk(image, document_id, i)
-                    chunks.append(image_chunk)
+            # Chunks are emitted in document order, so no sort is needed
+            chunks = list(self.iter_chunks(content, document_id))
             
-            # Sort chunks by their position in the document
-            chunks.sort(key=lambda x: x.get('chunk_index', 0))
-            
-            logger.info(f"Created {len(chunks)} chunks for document {document_id}")
+            logger.info("Created %d chunks for document %s", len(chunks), document_id)
             return chunks
             
         except Exception as e:
-            logger.error(f"Failed to chunk content for document {document_id}: {e}")
+            logger.error("Failed to chunk content for document %s: %s", document_id, e)
             raise RuntimeError(f"Content chunking failed: {e}")
     
-    async def _chunk_text(self, text: str, document_id: str, content_type: str) -> List[Dict[str, Any]]:
+    def iter_chunks(self, content: Dict[str, Any], document_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily chunk document content: text chunks, then tables, then images.
+        
+        Chunks are yielded in document order with consecutive chunk_index
+        values, so no sorting is needed afterwards.
+        
+        Each table and image chunk is only built when the consumer asks for it,
+        so downstream stages can start on the first chunks while later ones are
+        still pending, and never hold more than they have pulled.
+        
+        Args:
+            content: Extracted document content
+            document_id: Document identifier
+            
+        Yields:
+            Chunk dictionaries
+        """
+        # Process main text content (indexed 0..n-1 by _chunk_text)
+        next_index = 0
+        if content.get('text'):
+            for chunk in self._chunk_text(content['text'], document_id, 'text'):
+                next_index = chunk['chunk_index'] + 1
+                yield chunk
+        
+        # Process tables separately, placed after text chunks
+        for i, table in enumerate(content.get('tables') or []):
+            for chunk in self._chunk_table(table, document_id, i, next_index):
+                next_index += 1
+                yield chunk
+        
+        # Process images (store as metadata chunks), placed after tables
+        for i, image in enumerate(content.get('images') or []):
+            yield self._create_image_chunk(image, document_id, i, next_index)
+            next_index += 1
+    
+    def chunk_content_batched(self, content: Dict[str, Any], document_id: str,
+                              batch_size: int = 32) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Chunk document content and yield the chunks in fixed-size batches.
+        
+        Batches are yielded as soon as they fill up, in the same order as
+        iter_chunks, so callers can persist or embed each batch with one bulk
+        call (e.g. a batched embeddings request) instead of one call per chunk.
+        
+        Args:
+            content: Extracted document content
+            document_id: Document identifier
+            batch_size: Maximum number of chunks per batch
+            
+        Yields:
+            Lists of at most batch_size chunk dictionaries
+        """
+        yield from self.iter_chunk_batches(self.iter_chunks(content, document_id), batch_size)
+    
+    @staticmethod
+    def iter_chunk_batches(chunks: Iterable[Dict[str, Any]],
+                           batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Group chunks into lists of at most batch_size chunks."""
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+    
+    def _chunk_text(self, text: str, document_id: str, content_type: str) -> List[Dict[str, Any]]:
         """Chunk text content into optimal pieces."""
         if not text or not text.strip():
             return []
@@ -89,40 +256,46 @@ class DocumentChunker:
         # Split into paragraphs first
         paragraphs = self._split_into_paragraphs(text)
         
+        max_size = self.config.max_chunk_size
+        min_size = self.config.min_chunk_size
+        # Paragraph lengths including their "\n\n" separator, computed once
+        lengths = [len(p) + 2 for p in paragraphs]
+        
         chunks = []
-        current_chunk = ""
-        chunk_index = 0
-        
-        for paragraph in paragraphs:
-            # If adding this paragraph would exceed max size, finalize current chunk
-            if (len(current_chunk) + len(paragraph) > self.config.max_chunk_size 
-                and current_chunk.strip()):
-                
-                # Create chunk from current content
-                chunk = await self._create_text_chunk(
-                    current_chunk.strip(), document_id, content_type, chunk_index
-                )
-                chunks.append(chunk)
-                chunk_index += 1
-                
-                # Start new chunk with overlap
-                current_chunk = self._get_overlap_text(current_chunk) + paragraph
-            else:
-                current_chunk += paragraph + "\n\n"
-        
-        # Add final chunk if there's remaining content
-        if current_chunk.strip():
-            chunk = await self._create_text_chunk(
-                current_chunk.strip(), document_id, content_type, chunk_index
+        needs_optimizing = False
+        overlap = ""
+        start = 0
+        
+        while start < len(paragraphs):
+            # Take paragraphs [start, end) while they fit; always take at least one
+            current_length = len(overlap) + lengths[start]
+            end = start + 1
+            while end < len(paragraphs) and current_length + lengths[end] - 2 <= max_size:
+                current_length += lengths[end]
+                end += 1
+            
+            current_chunk = (overlap + "\n\n".join(paragraphs[start:end])).strip()
+            chunk = self._create_text_chunk(
+                current_chunk, document_id, content_type, len(chunks)
             )
+            
+            # Only run the optimizer pass when a chunk needs splitting or merging
+            if len(current_chunk) > max_size or (len(current_chunk) < min_size and chunks):
+                needs_optimizing = True
             chunks.append(chunk)
+            
+            # Start the next chunk with overlap
+            overlap = self._get_overlap_text(current_chunk)
+            start = end
         
         # Post-process chunks to ensure optimal sizes
-        chunks = await self._optimize_chunk_sizes(chunks, document_id)
+        if needs_optimizing:
+            chunks = self._optimize_chunk_sizes(chunks, document_id)
         
         return chunks
     
-    async def _chunk_table(self, table: Dict[str, Any], document_id: str, table_index: int) -> List[Dict[str, Any]]:
+    def _chunk_table(self, table: Dict[str, Any], document_id: str, table_index: int,
+                     chunk_index: int) -> List[Dict[str, Any]]:
         """Chunk table content."""
         table_content = table.get('content', '')
         table_metadata = table.get('metadata', {})
@@ -135,7 +308,7 @@ class DocumentChunker:
         chunk = {
             'chunk_id': f"{document_id}_table_{table_index}",
             'document_id': document_id,
-            'chunk_index': 1000 + table_index,  # Place tables after text chunks
+            'chunk_index': chunk_index,
             'content': table_content,
             'content_type': 'table',
             'metadata': {
@@ -147,7 +320,8 @@ class DocumentChunker:
         
         return [chunk]
     
-    async def _create_image_chunk(self, image: Dict[str, Any], document_id: str, image_index: int) -> Dict[str, Any]:
+    def _create_image_chunk(self, image: Dict[str, Any], document_id: str, image_index: int,
+                            chunk_index: int) -> Dict[str, Any]:
         """Create a chunk for image content."""
         image_content = image.get('content', '')
         image_metadata = image.get('metadata', {})
@@ -156,7 +330,7 @@ class DocumentChunker:
         chunk = {
             'chunk_id': f"{document_id}_image_{image_index}",
             'document_id': document_id,
-            'chunk_index': 2000 + image_index,  # Place images after tables
+            'chunk_index': chunk_index,
             'content': f"Image {image_index + 1}: {image_content}",
             'content_type': 'image',
             'metadata': {
@@ -168,13 +342,13 @@ class DocumentChunker:
         
         return chunk
     
-    async def _create_text_chunk(self, text: str, document_id: str, content_type: str, chunk_index: int) -> Dict[str, Any]:
+    def _create_text_chunk(self, text: str, document_id: str, content_type: str, chunk_index: int) -> Dict[str, Any]:
         """Create a text chunk with metadata."""
         # Generate unique chunk ID
         chunk_id = f"{document_id}_chunk_{chunk_index:03d}"
         
         # Extract key information from text
-        metadata = await self._extract_chunk_metadata(text, chunk_index)
+        metadata = self._extract_chunk_metadata(text, chunk_index)
         
         chunk = {
             'chunk_id': chunk_id,
@@ -187,32 +361,22 @@ class DocumentChunker:
         
         return chunk
     
-    async def _extract_chunk_metadata(self, text: str, chunk_index: int) -> Dict[str, Any]:
+    def _extract_chunk_metadata(self, text: str, chunk_index: int) -> Dict[str, Any]:
         """Extract metadata from chunk text."""
         metadata = {
             'chunk_type': 'text',
             'length': len(text),
-            'word_count': len(text.split()),
+            'word_count': _count_words(text),
             'chunk_index': chunk_index
         }
         
-        # Extract potential headers
-        headers = self._extract_headers(text)
+        headers, dates, numbers, entities = self._scan_text(text)
         if headers:
             metadata['headers'] = headers
-        
-        # Extract potential dates
-        dates = self._extract_dates(text)
         if dates:
             metadata['dates'] = dates
-        
-        # Extract potential numbers/amounts
-        numbers = self._extract_numbers(text)
         if numbers:
             metadata['numbers'] = numbers
-        
-        # Extract potential entities (simple pattern matching)
-        entities = self._extract_simple_entities(text)
         if entities:
             metadata['entities'] = entities
         
@@ -220,21 +384,21 @@ class DocumentChunker:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove excessive whitespace (str.split/join runs in C, unlike a \s+ regex)
+        text = ' '.join(text.split())
         
         # Remove special characters that might interfere with processing
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
+        text = text.translate(_CTRL_TABLE)
         
-        # Normalize line breaks
-        text = re.sub(r'\r\n|\r', '\n', text)
+        # Line breaks need no separate normalization: the whitespace pass above
+        # already turned every \r and \n into a space
         
         return text.strip()
     
     def _split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
         # Split by double newlines or paragraph breaks
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARA_SPLIT_RE.split(text)
         
         # Filter out empty paragraphs
         paragraphs = [p.strip() for p in paragraphs if p.strip()]
@@ -243,153 +407,112 @@ class DocumentChunker:
     
     def _get_overlap_text(self, text: str) -> str:
         """Get overlap text from the end of a chunk."""
-        if len(text) <= self.config.overlap_size:
+        overlap_size = self.config.overlap_size
+        if len(text) <= overlap_size:
             return text
         
-        # Try to find a good break point (sentence or word boundary)
-        overlap_text = text[-self.config.overlap_size:]
+        # Work with offsets into text and slice once at the end, instead of
+        # slicing the overlap window and re-slicing it at each break point
+        start = len(text) - overlap_size
         
-        # Find the last sentence boundary
-        sentence_end = overlap_text.rfind('.')
-        if sentence_end > self.config.overlap_size // 2:
-            overlap_text = overlap_text[sentence_end + 1:]
+        # Try to find a good break point: the last sentence boundary
+        sentence_end = text.rfind('.', start)
+        if sentence_end - start > overlap_size // 2:
+            start = sentence_end + 1
         
-        # Find the last word boundary
-        word_end = overlap_text.rfind(' ')
-        if word_end > 0:
-            overlap_text = overlap_text[word_end + 1:]
+        # Then the last word boundary
+        word_end = text.rfind(' ', start)
+        if word_end - start > 0:
+            start = word_end + 1
         
-        return overlap_text + " "
+        return text[start:] + " "
     
-    async def _optimize_chunk_sizes(self, chunks: List[Dict[str, Any]], document_id: str) -> List[Dict[str, Any]]:
-        """Optimize chunk sizes by splitting or merging chunks."""
+    def _optimize_chunk_sizes(self, chunks: List[Dict[str, Any]], document_id: str) -> List[Dict[str, Any]]:
+        """Optimize chunk sizes by splitting or merging chunks in a single pass."""
+        max_size = self.config.max_chunk_size
+        min_size = self.config.min_chunk_size
         optimized_chunks = []
         
+        def emit(chunk: Dict[str, Any]):
+            # Index chunks as they are emitted so no re-indexing pass is needed
+            chunk['chunk_index'] = len(optimized_chunks)
+            optimized_chunks.append(chunk)
+        
         for chunk in chunks:
             content = chunk['content']
             
             # If chunk is too large, split it further
-            if len(content) > self.config.max_chunk_size:
-                sub_chunks = await self._split_large_chunk(chunk, document_id)
-                optimized_chunks.extend(sub_chunks)
+            if len(content) > max_size:
+                for sub_chunk in self._split_large_chunk(chunk, document_id):
+                    emit(sub_chunk)
+                continue
             
-            # If chunk is too small, try to merge with next chunk
-            elif len(content) < self.config.min_chunk_size and optimized_chunks:
+            # If chunk is too small, try to merge with the previous chunk
+            if len(content) < min_size and optimized_chunks:
                 last_chunk = optimized_chunks[-1]
-                if (len(last_chunk['content']) + len(content) <= self.config.max_chunk_size):
+                if len(last_chunk['content']) + len(content) <= max_size:
                     # Merge chunks
                     last_chunk['content'] += "\n\n" + content
                     last_chunk['metadata']['merged_chunks'] = last_chunk['metadata'].get('merged_chunks', 0) + 1
                     continue
             
-            optimized_chunks.append(chunk)
-        
-        # Re-index chunks
-        for i, chunk in enumerate(optimized_chunks):
-            chunk['chunk_index'] = i
+            emit(chunk)
         
         return optimized_chunks
     
-    async def _split_large_chunk(self, chunk: Dict[str, Any], document_id: str) -> List[Dict[str, Any]]:
-        """Split a large chunk into smaller pieces."""
+    def _split_large_chunk(self, chunk: Dict[str, Any], document_id: str) -> List[Dict[str, Any]]:
+        """
+        Split a large chunk into smaller pieces.
+        
+        Sub-chunk metadata is {'parent_chunk', 'sub_chunk_index', 'parent_metadata'},
+        where 'parent_metadata' is the parent chunk's metadata dict, shared by
+        reference between all sub-chunks rather than copied into each of them.
+        """
         content = chunk['content']
         base_chunk_id = chunk['chunk_id']
         base_index = chunk['chunk_index']
+        content_type = chunk['content_type']
+        parent_metadata = chunk['metadata']
         
-        # Split by sentences first
-        sentences = re.split(r'(?<=[.!?])\s+', content)
-        
-        sub_chunks = []
-        current_chunk = ""
-        sub_index = 0
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) > self.config.max_chunk_size and current_chunk:
-                # Create sub-chunk
-                sub_chunk = {
-                    'chunk_id': f"{base_chunk_id}_sub_{sub_index}",
-                    'document_id': document_id,
-                    'chunk_index': base_index + sub_index * 0.1,  # Decimal indexing for sub-chunks
-                    'content': current_chunk.strip(),
-                    'content_type': chunk['content_type'],
-                    'metadata': {
-                        **chunk['metadata'],
-                        'parent_chunk': base_chunk_id,
-                        'sub_chunk_index': sub_index
-                    }
-                }
-                sub_chunks.append(sub_chunk)
-                sub_index += 1
-                current_chunk = sentence
-            else:
-                current_chunk += " " + sentence if current_chunk else sentence
-        
-        # Add final sub-chunk
-        if current_chunk.strip():
-            sub_chunk = {
+        def make_sub_chunk(text: str, sub_index: int) -> Dict[str, Any]:
+            return {
                 'chunk_id': f"{base_chunk_id}_sub_{sub_index}",
                 'document_id': document_id,
-                'chunk_index': base_index + sub_index * 0.1,
-                'content': current_chunk.strip(),
-                'content_type': chunk['content_type'],
+                # Integer (parent, sub) packing; stays ordered for up to 1000 sub-chunks
+                'chunk_index': base_index * 1000 + sub_index,
+                'content': text,
+                'content_type': content_type,
                 'metadata': {
-                    **chunk['metadata'],
                     'parent_chunk': base_chunk_id,
-                    'sub_chunk_index': sub_index
+                    'sub_chunk_index': sub_index,
+                    'parent_metadata': parent_metadata
                 }
             }
-            sub_chunks.append(sub_chunk)
+        
+        # Bucket sentence offsets, then slice each sub-chunk out of content once
+        max_size = self.config.max_chunk_size
+        sub_chunks = []
+        for start, end in _bucket_sentences(_sentence_spans(content), max_size):
+            text = content[start:end].strip()
+            if text:
+                sub_chunks.append(make_sub_chunk(text, len(sub_chunks)))
         
         return sub_chunks
     
-    def _extract_headers(self, text: str) -> List[str]:
-        """Extract potential headers from text."""
-        headers = []
+    def _scan_text(self, text: str) -> Tuple[List[str], List[str], List[str], Dict[str, List[str]]]:
+        """
+        Extract headers, dates, numbers and simple entities from chunk text.
         
-        # Look for lines that might be headers (short, capitalized, etc.)
-        lines = text.split('\n')
-        for line in lines[:5]:  # Check first 5 lines
-            line = line.strip()
-            if (len(line) < 100 and 
-                len(line.split()) <= 10 and 
-                (line.isupper() or line.istitle())):
-                headers.append(line)
+        Dates, numbers, emails, URLs and phones come from a single pass over
+        the text; names from a second pass that stops after 5 unique matches.
+        Dates and numbers are deduplicated in first-seen order.
         
-        return headers[:3]  # Return max 3 headers
-    
-    def _extract_dates(self, text: str) -> List[str]:
-        """Extract potential dates from text."""
-        # Common date patterns
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY or DD/MM/YYYY
-            r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',    # YYYY/MM/DD
-            r'\w+\s+\d{1,2},?\s+\d{4}',         # Month DD, YYYY
-        ]
-        
-        dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            dates.extend(matches)
-        
-        return list(set(dates))[:5]  # Return max 5 unique dates
-    
-    def _extract_numbers(self, text: str) -> List[str]:
-        """Extract potential numbers/amounts from text."""
-        # Look for currency amounts and large numbers
-        number_patterns = [
-            r'[\$€£¥₹]\s*\d+(?:,\d{3})*(?:\.\d+)?',  # Currency amounts
-            r'\d+(?:,\d{3})*(?:\.\d+)?',              # Numbers with commas
-        ]
-        
-        numbers = []
-        for pattern in number_patterns:
-            matches = re.findall(pattern, text)
-            numbers.extend(matches)
-        
-        return list(set(numbers))[:10]  # Return max 10 unique numbers
-    
-    def _extract_simple_entities(self, text: str) -> Dict[str, List[str]]:
-        """Extract simple entities using pattern matching."""
+        Returns:
+            Tuple of (headers, dates, numbers, entities)
+        """
+        # Dicts keep first-seen order while deduplicating
+        dates = {}
+        numbers = {}
         entities = {
             'emails': [],
             'phones': [],
@@ -397,23 +520,44 @@ class DocumentChunker:
             'names': []
         }
         
-        # Email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        entities['emails'] = re.findall(email_pattern, text)
-        
-        # Phone numbers
-        phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'
-        entities['phones'] = re.findall(phone_pattern, text)
-        
-        # URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        entities['urls'] = re.findall(url_pattern, text)
-        
-        # Simple name patterns (capitalized words)
-        name_pattern = r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'
-        entities['names'] = re.findall(name_pattern, text)[:5]  # Limit to 5 names
+        # Skip the combined scan when no group can match: no digits, '@' or URLs
+        if '@' in text or 'http' in text or _DIGIT_RE.search(text):
+            matches = _METADATA_RE.finditer(text)
+        else:
+            matches = ()
+
+        for match in matches:
+            group = match.lastgroup
+            if group in _ENTITY_GROUPS:
+                entities[group].append(match.group())
+            elif group in _DATE_GROUPS:
+                # Max 5 unique dates
+                if len(dates) < 5:
+                    dates[match.group()] = None
+            elif len(numbers) < 10:
+                # Max 10 unique numbers
+                numbers[match.group()] = None
+        
+        # Max 5 unique names (which need uppercase letters)
+        if not text.islower():
+            entities['names'] = _top_k_unique(_NAME_RE, text, 5)
         
         # Remove empty categories
         entities = {k: v for k, v in entities.items() if v}
         
-        return entities
+        return self._extract_headers(text), list(dates), list(numbers), entities
+    
+    def _extract_headers(self, text: str) -> List[str]:
+        """Extract potential headers from text."""
+        headers = []
+        
+        # Look for lines that might be headers (short, capitalized, etc.)
+        lines = text.split('\n', 5)[:5]  # Check first 5 lines
+        for line in lines:
+            line = line.strip()
+            if (len(line) < 100 and 
+                len(line.split()) <= 10 and 
+                (line.isupper() or line.istitle())):
+                headers.append(line)
+        
+        return headers[:3]  # Return max 3 headers
@@ -2,14 +2,195 @@
 Metadata extractor that integrates with langextract for structured data extraction.
 """
 
+import os
+import re
+import atexit
+import time
+import hashlib
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable
+from dataclasses import dataclass
 from core.schema_extractor import schema_extractor
 from core.openai_client import openai_client
+from core.safe_cache import cache_get, cache_set
+
+# Optional Aho-Corasick automaton for the keyword scans
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Dedicated pool for blocking extraction work, so it neither contends with nor
+# waits behind other users of the event loop's default executor
+_EXTRACT_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4, thread_name_prefix='metadata-extractor'
+)
+atexit.register(_EXTRACT_POOL.shutdown, wait=False)
+
+# Texts shorter than this are extracted inline; the pool hop would cost more
+INLINE_EXTRACTION_THRESHOLD = 512
+
+# Extraction results are cached by content hash so repeated chunks skip the
+# schema extraction. Bump the version when the result format changes
+# so entries written by older code are no longer read.
+METADATA_CACHE_TTL = 60 * 60 * 24
+METADATA_CACHE_VERSION = 1
+
+
+def _metadata_cache_key(text: str, schemas: List[str]) -> str:
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"metadata:{digest}:{','.join(sorted(schemas))}"
+
+
+# Common words per language
+_LANGUAGE_KEYWORDS = {
+    'en': frozenset(('the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by')),
+    'es': frozenset(('el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le')),
+    'fr': frozenset(('le', 'la', 'de', 'et', 'à', 'un', 'il', 'que', 'ne', 'se', 'ce', 'pas')),
+}
+
+# Keywords per document type
+_DOCUMENT_TYPE_KEYWORDS = {
+    'invoice': frozenset(('invoice', 'bill', 'payment', 'amount', 'total', 'due date', 'invoice number')),
+    'contract': frozenset(('agreement', 'contract', 'terms', 'conditions', 'parties', 'signature', 'effective date')),
+    'support_case': frozenset(('support', 'ticket', 'issue', 'problem', 'help', 'assistance', 'complaint')),
+    'refund_case': frozenset(('refund', 'return', 'cancel', 'reimbursement', 'money back')),
+}
+# Score denominators, so scoring does not take len() of the keyword sets per call
+_DOCUMENT_TYPE_SIZES = {
+    doc_type: len(keywords) for doc_type, keywords in _DOCUMENT_TYPE_KEYWORDS.items()
+}
+
+_ALL_KEYWORDS = frozenset().union(*_LANGUAGE_KEYWORDS.values(), *_DOCUMENT_TYPE_KEYWORDS.values())
+
+
+def _build_keyword_matcher(keywords: Iterable[str]):
+    """
+    Build the matcher used by _find_keywords for keywords.
+    
+    With pyahocorasick this is an automaton that reports every occurrence of
+    every keyword, overlaps included. Otherwise it is a lookahead alternation,
+    longest keyword first, reporting the longest keyword starting at every
+    position, plus the keywords each keyword contains.
+    """
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    alternation = '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    contained = {k: frozenset(other for other in keywords if other in k) for k in keywords}
+    return re.compile(rf'(?=({alternation}))'), contained
+
+
+_KEYWORD_MATCHER = _build_keyword_matcher(_ALL_KEYWORDS)
+
+
+def _find_keywords(text: str) -> frozenset:
+    """Return the language and document-type keywords that occur in text as substrings, in one pass."""
+    if AHOCORASICK_AVAILABLE:
+        return frozenset(keyword for _, keyword in _KEYWORD_MATCHER.iter(text))
+    
+    pattern, contained = _KEYWORD_MATCHER
+    # A keyword shadowed by a longer one at the same position is inside it
+    found = set()
+    for keyword in set(pattern.findall(text)):
+        found |= contained[keyword]
+    return frozenset(found)
+
+
+# Line prefixes that mark list items in structure scoring
+_STRUCTURE_PREFIXES = ('•', '-', '*', '1.', '2.', '3.')
+
+# Words ignored by topic extraction
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+
+# Topic candidates: words of at least 4 characters, punctuation excluded
+_TOPIC_TOKEN_RE = re.compile(r"[\w']{4,}")
+
+# Pattern-based entities in one alternation, dispatched by group name
+_ENTITY_RE = re.compile(
+    r'(?P<EMAIL>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<PHONE>\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b)'
+    r'|(?P<MONEY>[\$€£¥₹]\s*\d+(?:,\d{3})*(?:\.\d+)?)'
+)
+# Per-label (limit, confidence), in the order entities are reported
+_ENTITY_LIMITS = {
+    'EMAIL': (3, 0.9),
+    'PHONE': (3, 0.8),
+    'MONEY': (5, 0.9),
+}
+
+# Action-oriented phrases, in reporting order. Each kind is scanned on its own,
+# since phrases of different kinds overlap ("next step: we must call ...")
+_ACTION_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:please|kindly|should|must|need to|required to)\s+([^.!?]+[.!?])',
+    r'(?:action|task|todo|follow.?up|next step)[:\s]+([^.!?]+[.!?])',
+    r'(?:deadline|due date|by)\s+([^.!?]+[.!?])',
+))
+
+
+def _count_non_blank(parts: Iterable[str]) -> int:
+    """Count the parts that contain something other than whitespace."""
+    return sum(1 for part in parts if part and not part.isspace())
+
+
+@dataclass
+class TextStats:
+    """Text counts, lines and lowercased text shared by the analysis helpers, computed once per text."""
+    length: int
+    word_count: int
+    non_whitespace: int
+    sentence_count: int
+    sentence_word_count: int
+    paragraph_count: int
+    lines: List[str]
+    lower: str
+
+
+def _text_stats(text: str) -> TextStats:
+    """Compute the counts, lines and lowercased text shared by the analysis helpers."""
+    words = text.split()
+    return TextStats(
+        length=len(text),
+        word_count=len(words),
+        # str.split() drops exactly the characters str.isspace() matches
+        non_whitespace=sum(map(len, words)),
+        sentence_count=_count_non_blank(text.split('.')),
+        # Words summed over '.'-separated sentences, without splitting each one
+        sentence_word_count=len(text.replace('.', ' ').split()),
+        paragraph_count=_count_non_blank(text.split('\n\n')),
+        lines=text.splitlines(),
+        lower=text.lower(),
+    )
+
+
+def _is_header(line: str) -> bool:
+    """Check whether a stripped, non-empty line looks like a section header."""
+    return (
+        len(line) < 100
+        and line[-1] not in '.,'
+        and (line.isupper() or line.istitle())
+        # Word count last: it is the only check that allocates, and most lines
+        # have already failed the case test by now
+        and len(line.split()) <= 10
+    )
+
 
 class MetadataExtractor:
     """
@@ -17,9 +198,16 @@ class MetadataExtractor:
     from document chunks.
     """
     
-    def __init__(self):
-        """Initialize the metadata extractor."""
+    def __init__(self, inline_threshold: int = INLINE_EXTRACTION_THRESHOLD):
+        """
+        Initialize the metadata extractor.
+        
+        Args:
+            inline_threshold: Texts shorter than this are processed inline
+                instead of on the extractor thread pool
+        """
         self.default_schemas = ['invoice', 'support_case', 'refund_case']
+        self.inline_threshold = inline_threshold
         logger.info("MetadataExtractor initialized")
     
     async def extract_metadata(self, text: str, schemas: List[str] = None) -> Dict[str, Any]:
@@ -39,15 +227,22 @@ class MetadataExtractor:
         schemas = schemas or self.default_schemas
         
         try:
-            # Run schema extraction in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, self._run_schema_extraction, text, schemas
-            )
+            cache_key = _metadata_cache_key(text, schemas)
+            cached = cache_get(cache_key, version=METADATA_CACHE_VERSION)
+            if cached is not None:
+                logger.debug(f"Metadata cache hit for text of length {len(text)}")
+                return cached
+            
+            # Run schema extraction in thread pool to avoid blocking (inline for tiny texts)
+            (result,) = await self._run_helpers(text, (self._run_schema_extraction, text, schemas))
             
             # Enhance with additional metadata
             enhanced_result = await self._enhance_metadata(result, text)
             
+            # Failed extractions are not cached so they are retried next time
+            if 'error' not in result:
+                cache_set(cache_key, enhanced_result, METADATA_CACHE_TTL, version=METADATA_CACHE_VERSION)
+            
             logger.debug(f"Extracted metadata for text of length {len(text)}")
             return enhanced_result
             
@@ -55,6 +250,54 @@ class MetadataExtractor:
             logger.error(f"Failed to extract metadata: {e}")
             return {'error': str(e)}
     
+    async def extract_metadata_batch(self, texts: List[str], schemas: List[str] = None,
+                                     max_concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Extract metadata from several texts concurrently.
+        
+        Identical texts are extracted once and share the same result dict.
+        
+        Args:
+            texts: Text contents to process
+            schemas: List of schemas to apply to every text
+            max_concurrency: Most extractions running at once (unlimited if None)
+            
+        Returns:
+            List of metadata dictionaries, in the order of texts; an exception
+            raised while extracting a text is returned in its place
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        
+        async def extract(text: str) -> Dict[str, Any]:
+            if semaphore is None:
+                return await self.extract_metadata(text, schemas)
+            async with semaphore:
+                return await self.extract_metadata(text, schemas)
+        
+        unique_texts = list(dict.fromkeys(texts))
+        results = await asyncio.gather(
+            *(extract(text) for text in unique_texts),
+            return_exceptions=True
+        )
+        by_text = dict(zip(unique_texts, results))
+        return [by_text[text] for text in texts]
+    
+    async def _run_helpers(self, text: str, *calls) -> List[Any]:
+        """
+        Run (function, *args) calls for text and return their results in order.
+        
+        Calls for texts below the inline threshold run directly, since a
+        thread-pool round trip costs more than the work. Otherwise every call
+        is submitted to the extractor pool before any of them is awaited.
+        """
+        if len(text) < self.inline_threshold:
+            return [func(*args) for func, *args in calls]
+        
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(_EXTRACT_POOL, func, *args) for func, *args in calls)
+        )
+    
     def _run_schema_extraction(self, text: str, schemas: List[str]) -> Dict[str, Any]:
         """Run schema extraction (synchronous)."""
         try:
@@ -66,9 +309,7 @@ class MetadataExtractor:
             }
             
             # Extract using langextract
-            result = schema_extractor.extract_from_chunk(text, schemas, options)
-            
-            return result
+            return schema_extractor.extract_from_chunk(text, schemas, options)
             
         except Exception as e:
             logger.error(f"Schema extraction failed: {e}")
@@ -83,18 +324,20 @@ class MetadataExtractor:
         }
         
         try:
-            # Analyze text characteristics
-            enhanced['text_analysis'] = await self._analyze_text_characteristics(text)
+            stats = _text_stats(text)
             
-            # Extract content insights
-            enhanced['content_insights'] = await self._extract_content_insights(text, base_result)
+            # Analyze text characteristics and extract content insights concurrently
+            enhanced['text_analysis'], enhanced['content_insights'] = await asyncio.gather(
+                self._analyze_text_characteristics(text, stats),
+                self._extract_content_insights(text, base_result, stats)
+            )
             
             # Add processing metadata
             enhanced['processing_metadata'] = {
-                'text_length': len(text),
-                'word_count': len(text.split()),
-                'sentence_count': len([s for s in text.split('.') if s.strip()]),
-                'extraction_timestamp': asyncio.get_event_loop().time()
+                'text_length': stats.length,
+                'word_count': stats.word_count,
+                'sentence_count': stats.sentence_count,
+                'extraction_timestamp': time.monotonic()
             }
             
         except Exception as e:
@@ -103,7 +346,8 @@ class MetadataExtractor:
         
         return enhanced
     
-    async def _analyze_text_characteristics(self, text: str) -> Dict[str, Any]:
+    async def _analyze_text_characteristics(self, text: str,
+                                            stats: Optional[TextStats] = None) -> Dict[str, Any]:
         """Analyze basic text characteristics."""
         analysis = {
             'language_indicators': {},
@@ -112,14 +356,17 @@ class MetadataExtractor:
         }
         
         try:
-            # Language indicators
-            analysis['language_indicators'] = self._detect_language_indicators(text)
-            
-            # Document type indicators
-            analysis['document_type_indicators'] = self._detect_document_type(text)
-            
-            # Content density analysis
-            analysis['content_density'] = self._analyze_content_density(text)
+            text_lower = stats.lower if stats else text.lower()
+            (
+                analysis['language_indicators'],
+                analysis['document_type_indicators'],
+                analysis['content_density'],
+            ) = await self._run_helpers(
+                text,
+                (self._detect_language_indicators, text_lower),
+                (self._detect_document_type, text_lower),
+                (self._analyze_content_density, text, stats)
+            )
             
         except Exception as e:
             logger.warning(f"Failed to analyze text characteristics: {e}")
@@ -127,7 +374,8 @@ class MetadataExtractor:
         
         return analysis
     
-    async def _extract_content_insights(self, text: str, langextract_result: Dict[str, Any]) -> Dict[str, Any]:
+    async def _extract_content_insights(self, text: str, langextract_result: Dict[str, Any],
+                                        stats: Optional[TextStats] = None) -> Dict[str, Any]:
         """Extract additional content insights."""
         insights = {
             'key_topics': [],
@@ -137,17 +385,19 @@ class MetadataExtractor:
         }
         
         try:
-            # Extract key topics
-            insights['key_topics'] = self._extract_key_topics(text)
-            
-            # Extract important entities
-            insights['important_entities'] = self._extract_important_entities(text, langextract_result)
-            
-            # Identify document sections
-            insights['document_sections'] = self._identify_document_sections(text)
-            
-            # Extract potential action items
-            insights['action_items'] = self._extract_action_items(text)
+            text_lower = stats.lower if stats else text.lower()
+            (
+                insights['key_topics'],
+                insights['important_entities'],
+                insights['document_sections'],
+                insights['action_items'],
+            ) = await self._run_helpers(
+                text,
+                (self._extract_key_topics, text_lower),
+                (self._extract_important_entities, text, langextract_result),
+                (self._identify_document_sections, text, stats.lines if stats else None),
+                (self._extract_action_items, text)
+            )
             
         except Exception as e:
             logger.warning(f"Failed to extract content insights: {e}")
@@ -155,8 +405,8 @@ class MetadataExtractor:
         
         return insights
     
-    def _detect_language_indicators(self, text: str) -> Dict[str, Any]:
-        """Detect language indicators from text."""
+    def _detect_language_indicators(self, text_lower: str) -> Dict[str, Any]:
+        """Detect language indicators from lowercased text."""
         indicators = {
             'primary_language': 'en',  # Default to English
             'confidence': 0.5,
@@ -164,15 +414,11 @@ class MetadataExtractor:
         }
         
         # Simple language detection based on common words
-        english_words = ['the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']
-        spanish_words = ['el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le']
-        french_words = ['le', 'la', 'de', 'et', 'à', 'un', 'il', 'que', 'ne', 'se', 'ce', 'pas']
-        
-        text_lower = text.lower()
+        found = _find_keywords(text_lower)
         
-        english_count = sum(1 for word in english_words if word in text_lower)
-        spanish_count = sum(1 for word in spanish_words if word in text_lower)
-        french_count = sum(1 for word in french_words if word in text_lower)
+        english_count = len(found & _LANGUAGE_KEYWORDS['en'])
+        spanish_count = len(found & _LANGUAGE_KEYWORDS['es'])
+        french_count = len(found & _LANGUAGE_KEYWORDS['fr'])
         
         if english_count > spanish_count and english_count > french_count:
             indicators['primary_language'] = 'en'
@@ -186,48 +432,31 @@ class MetadataExtractor:
         
         return indicators
     
-    def _detect_document_type(self, text: str) -> Dict[str, Any]:
-        """Detect document type based on content."""
+    def _detect_document_type(self, text_lower: str) -> Dict[str, Any]:
+        """Detect document type based on lowercased content."""
         indicators = {
             'likely_types': [],
             'confidence_scores': {}
         }
         
-        text_lower = text.lower()
-        
-        # Invoice indicators
-        invoice_keywords = ['invoice', 'bill', 'payment', 'amount', 'total', 'due date', 'invoice number']
-        invoice_score = sum(1 for keyword in invoice_keywords if keyword in text_lower)
-        
-        # Contract indicators
-        contract_keywords = ['agreement', 'contract', 'terms', 'conditions', 'parties', 'signature', 'effective date']
-        contract_score = sum(1 for keyword in contract_keywords if keyword in text_lower)
-        
-        # Support case indicators
-        support_keywords = ['support', 'ticket', 'issue', 'problem', 'help', 'assistance', 'complaint']
-        support_score = sum(1 for keyword in support_keywords if keyword in text_lower)
-        
-        # Refund indicators
-        refund_keywords = ['refund', 'return', 'cancel', 'reimbursement', 'money back']
-        refund_score = sum(1 for keyword in refund_keywords if keyword in text_lower)
+        found = _find_keywords(text_lower)
         
         # Calculate scores
         scores = {
-            'invoice': invoice_score / len(invoice_keywords),
-            'contract': contract_score / len(contract_keywords),
-            'support_case': support_score / len(support_keywords),
-            'refund_case': refund_score / len(refund_keywords)
+            doc_type: len(found & keywords) / _DOCUMENT_TYPE_SIZES[doc_type]
+            for doc_type, keywords in _DOCUMENT_TYPE_KEYWORDS.items()
         }
         
-        # Sort by score
-        sorted_types = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        
-        indicators['likely_types'] = [doc_type for doc_type, score in sorted_types if score > 0.1]
+        # Sort the likely types by score (a stable sort, so ties keep declaration order)
+        indicators['likely_types'] = sorted(
+            (doc_type for doc_type, score in scores.items() if score > 0.1),
+            key=scores.__getitem__, reverse=True
+        )
         indicators['confidence_scores'] = scores
         
         return indicators
     
-    def _analyze_content_density(self, text: str) -> Dict[str, Any]:
+    def _analyze_content_density(self, text: str, stats: Optional[TextStats] = None) -> Dict[str, Any]:
         """Analyze content density and structure."""
         density = {
             'information_density': 0.0,
@@ -236,23 +465,25 @@ class MetadataExtractor:
         }
         
         try:
+            stats = stats or _text_stats(text)
+            
             # Calculate information density (non-whitespace characters / total characters)
-            non_whitespace = len([c for c in text if not c.isspace()])
-            density['information_density'] = non_whitespace / len(text) if text else 0
+            density['information_density'] = stats.non_whitespace / stats.length if text else 0
             
             # Calculate structure score based on formatting
-            lines = text.split('\n')
-            structured_lines = sum(1 for line in lines if line.strip() and (line.startswith(('•', '-', '*', '1.', '2.', '3.')) or ':' in line))
+            lines = stats.lines
+            # Either condition implies a non-blank line, so lines need no strip() copy
+            structured_lines = sum(1 for line in lines if line.startswith(_STRUCTURE_PREFIXES) or ':' in line)
             density['structure_score'] = structured_lines / len(lines) if lines else 0
             
             # Readability indicators
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
+            sentence_count = stats.sentence_count
+            avg_sentence_length = stats.sentence_word_count / sentence_count if sentence_count else 0
             
             density['readability_indicators'] = {
                 'average_sentence_length': avg_sentence_length,
-                'sentence_count': len(sentences),
-                'paragraph_count': len([p for p in text.split('\n\n') if p.strip()])
+                'sentence_count': sentence_count,
+                'paragraph_count': stats.paragraph_count
             }
             
         except Exception as e:
@@ -261,28 +492,13 @@ class MetadataExtractor:
         
         return density
     
-    def _extract_key_topics(self, text: str) -> List[str]:
-        """Extract key topics from text."""
-        topics = []
-        
+    def _extract_key_topics(self, text_lower: str) -> List[str]:
+        """Extract key topics from lowercased text."""
         # Simple topic extraction based on repeated important words
-        words = text.lower().split()
-        
-        # Filter out common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'}
-        
-        # Count word frequency
-        word_freq = {}
-        for word in words:
-            word = word.strip('.,!?;:"()[]{}')
-            if len(word) > 3 and word not in stop_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        words = (word for word in _TOPIC_TOKEN_RE.findall(text_lower) if word not in _STOP_WORDS)
         
-        # Get most frequent words as topics
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        topics = [word for word, freq in sorted_words[:10] if freq > 1]
-        
-        return topics
+        # Most frequent words as topics
+        return [word for word, freq in Counter(words).most_common(10) if freq > 1]
     
     def _extract_important_entities(self, text: str, langextract_result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract important entities from text and langextract results."""
@@ -301,50 +517,39 @@ class MetadataExtractor:
                     'source': 'langextract'
                 })
             
-            # Add simple pattern-based entities
-            import re
-            
-            # Email addresses
-            emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-            for email in emails[:3]:  # Limit to 3 emails
-                entities.append({
-                    'text': email,
-                    'label': 'EMAIL',
-                    'confidence': 0.9,
-                    'source': 'pattern'
-                })
-            
-            # Phone numbers
-            phones = re.findall(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b', text)
-            for phone in phones[:3]:  # Limit to 3 phones
-                entities.append({
-                    'text': phone,
-                    'label': 'PHONE',
-                    'confidence': 0.8,
-                    'source': 'pattern'
-                })
-            
-            # Currency amounts
-            amounts = re.findall(r'[\$€£¥₹]\s*\d+(?:,\d{3})*(?:\.\d+)?', text)
-            for amount in amounts[:5]:  # Limit to 5 amounts
-                entities.append({
-                    'text': amount,
-                    'label': 'MONEY',
-                    'confidence': 0.9,
-                    'source': 'pattern'
-                })
+            # Add simple pattern-based entities from a single pass over the text
+            found = {label: [] for label in _ENTITY_LIMITS}
+            remaining = sum(limit for limit, _ in _ENTITY_LIMITS.values())
+            for match in _ENTITY_RE.finditer(text):
+                label = match.lastgroup
+                if len(found[label]) < _ENTITY_LIMITS[label][0]:
+                    found[label].append(match.group())
+                    remaining -= 1
+                    # Stop scanning once every label has reached its limit
+                    if not remaining:
+                        break
+            
+            for label, (_, confidence) in _ENTITY_LIMITS.items():
+                for value in found[label]:
+                    entities.append({
+                        'text': value,
+                        'label': label,
+                        'confidence': confidence,
+                        'source': 'pattern'
+                    })
             
         except Exception as e:
             logger.warning(f"Failed to extract important entities: {e}")
         
         return entities
     
-    def _identify_document_sections(self, text: str) -> List[Dict[str, Any]]:
-        """Identify document sections."""
+    def _identify_document_sections(self, text: str, lines: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Identify document sections, reusing already split lines when given."""
         sections = []
         
         try:
-            lines = text.split('\n')
+            if lines is None:
+                lines = text.splitlines()
             current_section = None
             
             for i, line in enumerate(lines):
@@ -353,11 +558,7 @@ class MetadataExtractor:
                     continue
                 
                 # Check if line looks like a header
-                if (len(line) < 100 and 
-                    len(line.split()) <= 10 and 
-                    (line.isupper() or line.istitle()) and
-                    not line.endswith('.') and
-                    not line.endswith(',')):
+                if _is_header(line):
                     
                     if current_section:
                         sections.append(current_section)
@@ -387,19 +588,11 @@ class MetadataExtractor:
         action_items = []
         
         try:
-            # Look for action-oriented phrases
-            action_patterns = [
-                r'(?:please|kindly|should|must|need to|required to)\s+([^.!?]+[.!?])',
-                r'(?:action|task|todo|follow.?up|next step)[:\s]+([^.!?]+[.!?])',
-                r'(?:deadline|due date|by)\s+([^.!?]+[.!?])',
-            ]
-            
-            import re
-            for pattern in action_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches[:3]:  # Limit to 3 per pattern
+            # Look for action-oriented phrases, stopping each scan after 3 matches
+            for pattern in _ACTION_RES:
+                for match in islice(pattern.finditer(text), 3):
                     action_items.append({
-                        'text': match.strip(),
+                        'text': match.group(1).strip(),
                         'type': 'action_item',
                         'confidence': 0.7
                     })
@@ -0,0 +1,63 @@
+"""
+Worker process pools for CPU-bound document processing.
+"""
+
+import atexit
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """
+    A process pool created on first use, so importing a module that defines one
+    never starts processes, and replaced after a worker dies.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Args:
+            name: Name of the work run on the pool, for log messages
+            max_workers: Number of worker processes
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # One exit handler per pool, for whichever executor is current at exit
+        atexit.register(self._shutdown)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _shutdown(self):
+        """Shut down the current executor, if any, without waiting for its work."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor so the next call starts a fresh one."""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run func(*args) in a worker process.
+
+        If a worker dies, the pool is replaced for later calls and BrokenProcessPool
+        is raised. The call is not retried: input that crashes a worker (e.g. out of
+        memory) would break the new pool too, failing all its other work again.
+        """
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            logger.warning(f"{self.name} worker process died; restarting the process pool")
+            self._discard(executor)
+            raise
@@ -4,20 +4,17 @@ Main document processor for handling file uploads and processing pipeline.
 
 import os
 import uuid
+import hashlib
+import time
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Callable
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Optional imports with fallbacks
-try:
-    import aiofiles
-    AIOFILES_AVAILABLE = True
-except ImportError:
-    AIOFILES_AVAILABLE = False
-    aiofiles = None
-
 try:
     from docling.document_converter import DocumentConverter
     from docling.datamodel.base_models import PipelineOptions
@@ -27,13 +24,197 @@ except ImportError:
     DocumentConverter = None
     PipelineOptions = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+    blake3 = None
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+import httpx
+from postgrest.exceptions import APIError
+
 from .chunker import DocumentChunker
+from .process_pool import WorkerPool
 from .extractor import MetadataExtractor
 from core.supabase_client import supabase_client
 from core.openai_client import openai_client
+from core.safe_cache import cache_get, cache_get_many, cache_set, cache_set_many, cache_delete
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by list_documents; matches the fields of the API's DocumentSerializer
+# so the rows can be returned to clients as-is.
+DOCUMENT_LIST_COLUMNS = (
+    'id, filename, original_filename, file_type, file_size, upload_status, '
+    'processing_status, processing_error, created_at, updated_at, processed_at, metadata'
+)
+
+# Short-lived caches for read endpoints that clients poll while a document processes.
+# Status entries are deleted on every status update. List pages are keyed by a list
+# generation that every upload, status update and delete replaces; with the per-process
+# default cache, other processes still serve their own pages until they expire.
+DOCUMENT_STATUS_CACHE_TTL = 5
+DOCUMENT_LIST_CACHE_TTL = 30
+DOCUMENT_LIST_GENERATION_KEY = 'doclist:generation'
+
+# Maximum number of chunks whose metadata and embeddings are generated at once
+CHUNK_PROCESSING_CONCURRENCY = 16
+
+# Docling output is cached by file content hash, and embeddings by text hash, so
+# re-uploaded files and repeated chunks skip conversion and embedding requests
+EXTRACTED_CONTENT_CACHE_TTL = 86400
+EMBEDDING_CACHE_TTL = 86400
+
+# Attempts made for each Supabase write, with exponential backoff between them
+STORAGE_MAX_ATTEMPTS = 3
+
+# PostgREST errors that mean the database was unreachable or rolled the statement
+# back, so the request can be sent again: PostgREST's connection and schema cache
+# errors, and the Postgres connection exception (08), transaction rollback (40),
+# insufficient resources (53) and operator intervention (57) classes
+TRANSIENT_POSTGREST_CODES = frozenset({'PGRST000', 'PGRST001', 'PGRST002'})
+TRANSIENT_SQLSTATE_CLASSES = frozenset({'08', '40', '53', '57'})
+
+# Bytes from an async upload stream collected before they are hashed and written in a thread
+STREAM_WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+# Docling conversion is CPU-bound, so it runs in worker processes that each hold
+# one converter
+_DOCLING_POOL = WorkerPool('Docling', max_workers=max(1, (os.cpu_count() or 2) // 2))
+_docling_converter = None
+
+
+async def _run_docling_conversion(file_path: str) -> Dict[str, Any]:
+    """Convert a file in a docling worker process; see WorkerPool.run for worker deaths."""
+    return await _DOCLING_POOL.run(_docling_convert_worker, file_path)
+
+
+def _docling_convert_worker(file_path: str) -> Dict[str, Any]:
+    """Convert a file with this process's docling converter, returning picklable content."""
+    global _docling_converter
+    if _docling_converter is None:
+        _docling_converter = DocumentProcessor._init_docling_converter()
+        if _docling_converter is None:
+            raise RuntimeError("Docling converter could not be initialized")
+    return DocumentProcessor._process_docling_result(_docling_converter.convert(file_path))
+
+
+def _content_hasher():
+    """Hasher for upload content: BLAKE3 or XXH3-128 when installed, else hashlib's BLAKE2b."""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _write_file(file_path: Path, data: bytes, hasher):
+    """Hash and write data to file_path; run in a thread so the open and write cost one hop."""
+    hasher.update(data)
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+
+def _write_chunks(file_path: Path, chunks: Iterable[bytes], track_chunk: Callable[[bytes], None]):
+    """Write an iterable of chunks to file_path, passing each to track_chunk before it is written."""
+    with open(file_path, 'wb') as f:
+        for chunk in chunks:
+            track_chunk(chunk)
+            f.write(chunk)
+
+
+def _append_chunks(f, chunks: List[bytes], hasher):
+    """Hash and write buffered chunks to an open file; run in a thread."""
+    for chunk in chunks:
+        hasher.update(chunk)
+        f.write(chunk)
+
+
+def _is_transient_error(error: Exception, idempotent: bool) -> bool:
+    """
+    Whether a failed Supabase request may be sent again.
+    
+    Requests that are not idempotent (inserts) are only resent when they were
+    certainly not applied; a timeout or gateway error after the request was sent
+    may hide a committed insert.
+    """
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        # The request never reached the server
+        return True
+    if isinstance(error, APIError):
+        if isinstance(error.code, int):
+            # A response that wasn't PostgREST JSON (e.g. from a gateway): only its status is known
+            return idempotent and error.code >= 500
+        code = str(error.code)
+        return code in TRANSIENT_POSTGREST_CODES or code[:2] in TRANSIENT_SQLSTATE_CLASSES
+    return idempotent and isinstance(error, httpx.TransportError)
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with offset, for timestamptz columns."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _document_status_cache_key(document_id: str) -> str:
+    return f"docstatus:{document_id}"
+
+
+def _document_list_cache_key(limit: int, offset: int) -> str:
+    generation = cache_get(DOCUMENT_LIST_GENERATION_KEY)
+    if generation is None:
+        generation = _invalidate_document_lists()
+    return f"doclist:{generation}:{limit}:{offset}"
+
+
+def _invalidate_document_lists() -> str:
+    """Start a new list generation, so list pages cached before a change are not read."""
+    generation = uuid.uuid4().hex
+    cache_set(DOCUMENT_LIST_GENERATION_KEY, generation, None)
+    return generation
+
+
+def _vector_literal(embedding: List[float]) -> Union[str, List[float]]:
+    """
+    Encode an embedding as pgvector's text form '[x,y,...]' using orjson.
+    
+    The Supabase client encodes request bodies with the stdlib json module, which is slow
+    on long float lists; a pre-encoded string is passed through nearly as-is. The vector
+    column stores float4, so values are written in their shortest float32 form when numpy
+    is available: the same stored vector in about 40% fewer bytes.
+    """
+    if not ORJSON_AVAILABLE:
+        return embedding
+    if NUMPY_AVAILABLE:
+        return orjson.dumps(np.asarray(embedding, dtype=np.float32), option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return orjson.dumps(embedding).decode()
+
+
+def _embedding_cache_key(text: str) -> str:
+    return f"embedding:{openai_client.model}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
 
 class DocumentProcessor:
     """
@@ -61,15 +242,13 @@ class DocumentProcessor:
         self.chunker = DocumentChunker()
         self.extractor = MetadataExtractor()
         
-        # Initialize docling converter
-        self.converter = self._init_docling_converter()
-        
         # Ensure upload directory exists
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"DocumentProcessor initialized with upload_dir: {self.upload_dir}")
     
-    def _init_docling_converter(self) -> Optional[DocumentConverter]:
+    @staticmethod
+    def _init_docling_converter() -> Optional[DocumentConverter]:
         """Initialize docling document converter with optimized settings."""
         if not DOCLING_AVAILABLE:
             logger.warning("Docling not available - document processing will be limited")
@@ -87,7 +266,7 @@ class DocumentProcessor:
             logger.error(f"Failed to initialize docling converter: {e}")
             return None
     
-    async def process_document(self, file_data: bytes, filename: str, 
+    async def process_document(self, file_data: Union[bytes, Any], filename: str, 
                              user_id: str, schemas: List[str] = None, 
                              enable_docling: bool = True, 
                              processing_options: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -95,7 +274,9 @@ class DocumentProcessor:
         Process a document through the complete pipeline.
         
         Args:
-            file_data: Raw file data
+            file_data: Raw file data, an uploaded file object (e.g. Django's UploadedFile)
+                or an async iterator of bytes; files and iterators are streamed to disk
+                without being read into memory
             filename: Original filename
             user_id: User ID for the document
             schemas: List of schemas to apply for metadata extraction
@@ -106,14 +287,14 @@ class DocumentProcessor:
             Dictionary with processing results
         """
         document_id = str(uuid.uuid4())
-        start_time = datetime.utcnow()
+        start_ns = time.monotonic_ns()
         
         try:
             # Validate file
             file_info = self._validate_file(file_data, filename)
             
             # Store file
-            file_path = await self._store_file(file_data, filename, document_id)
+            file_path = await self._store_file(file_data, filename, document_id, file_info)
             
             # Create document record in database
             doc_record = await self._create_document_record(
@@ -122,7 +303,9 @@ class DocumentProcessor:
             
             # Extract content using docling
             logger.info(f"Extracting content from {filename} using docling")
-            extracted_content = await self._extract_content(file_path, file_info['file_type'], enable_docling)
+            extracted_content = await self._extract_content(
+                file_path, file_info['file_type'], enable_docling, file_info.get('content_hash')
+            )
             
             # Chunk the document
             logger.info(f"Chunking document {document_id}")
@@ -134,16 +317,14 @@ class DocumentProcessor:
                 chunks, document_id, schemas or ['invoice', 'support_case']
             )
             
-            # Store processed chunks in database
-            await self._store_processed_chunks(processed_chunks, document_id, user_id)
-            
             # Extract and aggregate metadata from all chunks
             document_metadata = await self._aggregate_document_metadata(processed_chunks)
             
-            # Update document status and metadata
+            # Store processed chunks, then update document status and metadata
+            await self._store_processed_chunks(processed_chunks, document_id, user_id)
             await self._update_document_status(document_id, 'completed', metadata=document_metadata)
             
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            processing_time = (time.monotonic_ns() - start_ns) / 1e9
             
             result = {
                 'document_id': document_id,
@@ -163,41 +344,101 @@ class DocumentProcessor:
             await self._update_document_status(document_id, 'failed', str(e))
             raise RuntimeError(f"Document processing failed: {e}")
     
-    def _validate_file(self, file_data: bytes, filename: str) -> Dict[str, Any]:
+    @staticmethod
+    def _get_file_size(file_data: Union[bytes, Any]) -> Optional[int]:
+        """Get the size of raw file data or an uploaded file object, or None if not known up front."""
+        if isinstance(file_data, (bytes, bytearray, memoryview)):
+            return len(file_data)
+        return getattr(file_data, 'size', None)
+    
+    def _validate_file(self, file_data: Union[bytes, Any], filename: str) -> Dict[str, Any]:
         """Validate uploaded file."""
-        # Check file size
-        if len(file_data) > self.max_file_size:
-            raise ValueError(f"File size {len(file_data)} exceeds maximum {self.max_file_size}")
-        
         # Check file extension
         file_ext = Path(filename).suffix.lower()
         if file_ext not in self.supported_formats:
             raise ValueError(f"Unsupported file format: {file_ext}. Supported: {self.supported_formats}")
         
+        # Check file size; streams of unknown size are checked while they are written
+        file_size = self._get_file_size(file_data)
+        if file_size is not None and file_size > self.max_file_size:
+            raise ValueError(f"File size {file_size} exceeds maximum {self.max_file_size}")
+        
         return {
             'file_type': file_ext[1:],  # Remove the dot
-            'file_size': len(file_data),
+            'file_size': file_size,
             'original_filename': filename
         }
     
-    async def _store_file(self, file_data: bytes, filename: str, document_id: str) -> str:
-        """Store uploaded file to disk."""
+    async def _store_file(self, file_data: Union[bytes, Any], filename: str, document_id: str,
+                          file_info: Dict[str, Any]) -> str:
+        """Store uploaded file to disk, recording its size and content hash in file_info."""
         # Create safe filename
         safe_filename = f"{document_id}_{filename}"
         file_path = self.upload_dir / safe_filename
         
-        # Write file asynchronously if aiofiles is available, otherwise synchronously
-        if AIOFILES_AVAILABLE:
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(file_data)
+        # The content is hashed as it is written, for the extracted content cache
+        hasher = _content_hasher()
+        
+        if not isinstance(file_data, (bytes, bytearray, memoryview)):
+            # Uploaded file object or byte stream: stream it to disk instead of reading it into memory
+            try:
+                file_info['file_size'] = await self._store_uploaded_file(file_data, file_path, hasher)
+            except ValueError:
+                # Don't leave a partial file behind for oversized streams
+                file_path.unlink(missing_ok=True)
+                raise
         else:
-            # Fallback to synchronous file writing
-            with open(file_path, 'wb') as f:
-                f.write(file_data)
+            # Write file in a thread to keep the event loop free
+            await asyncio.to_thread(_write_file, file_path, file_data, hasher)
+        
+        file_info['content_hash'] = hasher.hexdigest()
         
         logger.info(f"Stored file {filename} as {file_path}")
         return str(file_path)
     
+    async def _store_uploaded_file(self, uploaded_file: Any, file_path: Path, hasher) -> int:
+        """
+        Stream an uploaded file object to disk chunk by chunk, feeding each chunk to hasher.
+        
+        Accepts Django UploadedFile objects and async iterators of bytes. Returns the
+        number of bytes written, raising ValueError once it exceeds max_file_size.
+        """
+        size = 0
+        
+        def track_size(chunk: bytes):
+            nonlocal size
+            size += len(chunk)
+            if size > self.max_file_size:
+                raise ValueError(f"File size exceeds maximum {self.max_file_size}")
+        
+        def track_chunk(chunk: bytes):
+            track_size(chunk)
+            hasher.update(chunk)
+        
+        if hasattr(uploaded_file, '__aiter__'):
+            # Write a buffer of chunks per thread call, checking the size as they arrive
+            f = await asyncio.to_thread(open, file_path, 'wb')
+            try:
+                buffer = []
+                buffered = 0
+                async for chunk in uploaded_file:
+                    track_size(chunk)
+                    buffer.append(chunk)
+                    buffered += len(chunk)
+                    if buffered >= STREAM_WRITE_BUFFER_BYTES:
+                        await asyncio.to_thread(_append_chunks, f, buffer, hasher)
+                        buffer = []
+                        buffered = 0
+                if buffer:
+                    await asyncio.to_thread(_append_chunks, f, buffer, hasher)
+            finally:
+                await asyncio.to_thread(f.close)
+        else:
+            # Read and write every chunk (from memory or the upload's temporary file) in one thread call
+            await asyncio.to_thread(_write_chunks, file_path, uploaded_file.chunks(), track_chunk)
+        
+        return size
+    
     async def _create_document_record(self, document_id: str, filename: str, 
                                     file_info: Dict[str, Any], file_path: str, user_id: str) -> Dict[str, Any]:
         """Create document record in database."""
@@ -222,6 +463,7 @@ class DocumentProcessor:
             }
             
             response = client.table('langextract_documents').insert(doc_data).execute()
+            _invalidate_document_lists()
             
             if response.data:
                 logger.info(f"Created document record for {document_id}")
@@ -233,9 +475,14 @@ class DocumentProcessor:
             logger.error(f"Failed to create document record: {e}")
             raise
     
-    async def _extract_content(self, file_path: str, file_type: str, enable_docling: bool = True) -> Dict[str, Any]:
-        """Extract content from document using docling by default for all supported formats."""
-        logger.info(f"Extract content called with enable_docling={enable_docling}, file_type={file_type}, DOCLING_AVAILABLE={DOCLING_AVAILABLE}, converter={self.converter is not None}")
+    async def _extract_content(self, file_path: str, file_type: str, enable_docling: bool = True,
+                               content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract content from document using docling by default for all supported formats.
+        
+        Docling results are cached by content_hash, when given, so re-uploads skip conversion.
+        """
+        logger.info(f"Extract content called with enable_docling={enable_docling}, file_type={file_type}, DOCLING_AVAILABLE={DOCLING_AVAILABLE}")
         
         # Supported file types for docling processing
         supported_docling_types = {'pdf', 'docx', 'doc', 'txt', 'md'}
@@ -243,14 +490,6 @@ class DocumentProcessor:
         # Check if docling should be used - enabled by default for supported file types
         should_use_docling = enable_docling and file_type.lower() in supported_docling_types and DOCLING_AVAILABLE
         
-        # If docling is enabled but converter is not available, try to initialize it
-        if should_use_docling and not self.converter:
-            logger.info("Docling enabled but converter not available, attempting to initialize...")
-            self.converter = self._init_docling_converter()
-            if not self.converter:
-                logger.warning("Failed to initialize docling converter, falling back to text extraction")
-                should_use_docling = False
-        
         logger.info(f"Should use docling: {should_use_docling}")
         
         if not should_use_docling:
@@ -258,30 +497,32 @@ class DocumentProcessor:
             logger.warning(f"Docling not enabled or not available for {file_type}, using fallback text extraction")
             return self._fallback_text_extraction(file_path, file_type)
             
+        cache_key = f"docling:{content_hash}:{file_type.lower()}" if content_hash else None
+        
+        if cache_key:
+            cached = cache_get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached docling content for {file_path}")
+                return cached
+        
         try:
             logger.info(f"Using docling to extract content from {file_path} (file_type: {file_type})")
-            # Run docling conversion in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, self._run_docling_conversion, file_path
-            )
-            
-            # Process the result
-            content = self._process_docling_result(result)
-            
-            logger.info(f"Successfully extracted content from {file_path}: {len(content.get('text', ''))} chars")
-            return content
-            
+            # Run docling conversion and result processing in a worker process
+            content = await _run_docling_conversion(file_path)
+        except BrokenProcessPool:
+            # Placeholder text would hide the failure; let the document fail instead
+            logger.error(f"Docling worker process died converting {file_path}")
+            raise
         except Exception as e:
             logger.error(f"Failed to extract content from {file_path}: {e}")
             # Fallback to simple text extraction
             return self._fallback_text_extraction(file_path, file_type)
-    
-    def _run_docling_conversion(self, file_path: str):
-        """Run docling conversion (synchronous)."""
-        if self.converter:
-            return self.converter.convert(file_path)
-        return None
+        
+        if cache_key:
+            cache_set(cache_key, content, EXTRACTED_CONTENT_CACHE_TTL)
+        
+        logger.info(f"Successfully extracted content from {file_path}: {len(content.get('text', ''))} chars")
+        return content
     
     def _fallback_text_extraction(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """Fallback text extraction when docling is not available."""
@@ -315,7 +556,8 @@ class DocumentProcessor:
         
         return content
     
-    def _process_docling_result(self, result) -> Dict[str, Any]:
+    @staticmethod
+    def _process_docling_result(result) -> Dict[str, Any]:
         """Process docling conversion result."""
         content = {
             'text': '',
@@ -325,44 +567,34 @@ class DocumentProcessor:
         }
         
         try:
-            # Extract main text from the result
-            if hasattr(result, 'document') and result.document:
-                doc = result.document
-                
-                # Get main text content
-                if hasattr(doc, 'text') and doc.text:
-                    content['text'] = doc.text
-                elif hasattr(doc, 'export_to_markdown'):
-                    # Try to get text via markdown export
-                    content['text'] = doc.export_to_markdown()
-                
-                # Extract tables if available
-                if hasattr(doc, 'tables') and doc.tables:
-                    for table in doc.tables:
-                        table_data = {
-                            'content': str(table),
-                            'metadata': getattr(table, 'metadata', {})
-                        }
-                        content['tables'].append(table_data)
-                
-                # Extract images if available
-                if hasattr(doc, 'images') and doc.images:
-                    for image in doc.images:
-                        image_data = {
-                            'content': str(image),
-                            'metadata': getattr(image, 'metadata', {})
-                        }
-                        content['images'].append(image_data)
+            # Each attribute is looked up once with getattr(..., None) rather than probed
+            # with hasattr and then read again
+            doc = getattr(result, 'document', None)
+            
+            # Get main text content from the document, or directly from the result
+            source = doc if doc else result
+            text = getattr(source, 'text', None)
+            if text:
+                content['text'] = text
+            else:
+                # Try to get text via markdown export
+                export_to_markdown = getattr(source, 'export_to_markdown', None)
+                if export_to_markdown is not None:
+                    content['text'] = export_to_markdown()
+            
+            if doc:
+                # Extract tables and images if available
+                for key in ('tables', 'images'):
+                    for item in getattr(doc, key, None) or ():
+                        content[key].append({
+                            'content': str(item),
+                            'metadata': getattr(item, 'metadata', {})
+                        })
                 
                 # Extract metadata
-                if hasattr(doc, 'metadata') and doc.metadata:
-                    content['metadata'] = doc.metadata
-            else:
-                # If no document attribute, try to get text directly from result
-                if hasattr(result, 'text') and result.text:
-                    content['text'] = result.text
-                elif hasattr(result, 'export_to_markdown'):
-                    content['text'] = result.export_to_markdown()
+                metadata = getattr(doc, 'metadata', None)
+                if metadata:
+                    content['metadata'] = metadata
                 
         except Exception as e:
             logger.warning(f"Error processing docling result: {e}")
@@ -372,7 +604,7 @@ class DocumentProcessor:
     async def _chunk_document(self, content: Dict[str, Any], document_id: str) -> List[Dict[str, Any]]:
         """Chunk the extracted document content."""
         try:
-            chunks = await self.chunker.chunk_content(content, document_id)
+            chunks = self.chunker.chunk_content(content, document_id)
             logger.info(f"Created {len(chunks)} chunks for document {document_id}")
             return chunks
             
@@ -383,38 +615,43 @@ class DocumentProcessor:
     async def _process_chunks(self, chunks: List[Dict[str, Any]], document_id: str, 
                             schemas: List[str]) -> List[Dict[str, Any]]:
         """Process chunks with metadata extraction and embedding generation."""
-        processed_chunks = []
+        texts = [chunk['content'] for chunk in chunks]
         
-        for i, chunk in enumerate(chunks):
-            try:
-                # Extract metadata using langextract
-                extracted_metadata = await self.extractor.extract_metadata(
-                    chunk['content'], schemas
-                )
-                
-                # Generate embeddings
-                embeddings = await self._generate_embeddings(chunk['content'])
-                
-                # Combine all data
-                processed_chunk = {
-                    'id': str(uuid.uuid4()),
-                    'document_id': document_id,
-                    'chunk_id': chunk['chunk_id'],
-                    'chunk_index': i,
-                    'content': chunk['content'],
-                    'content_type': chunk.get('content_type', 'text'),
-                    'chunk_metadata': chunk.get('metadata', {}),
-                    'extracted_metadata': extracted_metadata,
-                    'embeddings': embeddings,
-                    'created_at': datetime.utcnow().isoformat()
-                }
-                
-                processed_chunks.append(processed_chunk)
-                
-            except Exception as e:
-                logger.error(f"Failed to process chunk {i} for document {document_id}: {e}")
+        # Generate embeddings for all chunks in batched requests, alongside metadata extraction
+        embeddings_task = asyncio.ensure_future(self._generate_embeddings_batch(texts))
+        
+        # Extract metadata using langextract, at most CHUNK_PROCESSING_CONCURRENCY
+        # chunks at a time; repeated chunk texts are extracted once. Results
+        # come back in chunk order
+        results = await self.extractor.extract_metadata_batch(
+            texts, schemas, max_concurrency=CHUNK_PROCESSING_CONCURRENCY
+        )
+        all_embeddings = await embeddings_task
+        
+        # One random buffer for all chunk IDs and one timestamp for the whole document
+        random_bytes = os.urandom(16 * len(chunks))
+        created_at = _now_iso()
+        
+        processed_chunks = []
+        for i, (chunk, extracted_metadata, embeddings) in enumerate(zip(chunks, results, all_embeddings)):
+            if isinstance(extracted_metadata, Exception):
+                logger.error(f"Failed to process chunk {i} for document {document_id}: {extracted_metadata}")
                 # Continue processing other chunks
                 continue
+            
+            # Combine all data
+            processed_chunks.append({
+                'id': str(uuid.UUID(bytes=random_bytes[i * 16:(i + 1) * 16], version=4)),
+                'document_id': document_id,
+                'chunk_id': chunk['chunk_id'],
+                'chunk_index': i,
+                'content': chunk['content'],
+                'content_type': chunk.get('content_type', 'text'),
+                'chunk_metadata': chunk.get('metadata', {}),
+                'extracted_metadata': extracted_metadata,
+                'embeddings': embeddings,
+                'created_at': created_at
+            })
         
         return processed_chunks
     
@@ -434,21 +671,21 @@ class DocumentProcessor:
                 'extraction_summary': {
                     'successful_extractions': 0,
                     'failed_extractions': 0,
-                    'schemas_applied': set()
+                    'schemas_applied': []
                 }
             }
             
-            # Aggregate data from all chunks
+            # Aggregate data from all chunks in a single pass
             all_entities = []
             all_sections = []
             all_action_items = []
+            all_types = []
             total_text_length = 0
             successful_extractions = 0
             
             for chunk in processed_chunks:
                 # Sum text length
-                chunk_text_length = len(chunk.get('content', ''))
-                total_text_length += chunk_text_length
+                total_text_length += len(chunk.get('content', ''))
                 
                 # Extract metadata from chunk
                 extracted_metadata = chunk.get('extracted_metadata', {})
@@ -456,62 +693,42 @@ class DocumentProcessor:
                 if extracted_metadata and not extracted_metadata.get('error'):
                     successful_extractions += 1
                     
-                    # Aggregate document type indicators
-                    langextract_result = extracted_metadata.get('langextract_result', {})
-                    if langextract_result:
-                        # This would contain schema-specific extracted data
-                        pass
-                    
-                    # Aggregate entities
+                    # Aggregate entities, sections and action items
                     content_insights = extracted_metadata.get('content_insights', {})
                     if content_insights:
-                        entities = content_insights.get('important_entities', [])
-                        all_entities.extend(entities)
-                        
-                        sections = content_insights.get('document_sections', [])
-                        all_sections.extend(sections)
-                        
-                        action_items = content_insights.get('action_items', [])
-                        all_action_items.extend(action_items)
+                        all_entities.extend(content_insights.get('important_entities', ()))
+                        # Only the first 10 sections and action items are kept
+                        if len(all_sections) < 10:
+                            all_sections.extend(content_insights.get('document_sections', ()))
+                        if len(all_action_items) < 10:
+                            all_action_items.extend(content_insights.get('action_items', ()))
                     
-                    # Track schemas applied
-                    text_analysis = extracted_metadata.get('text_analysis', {})
-                    doc_type_indicators = text_analysis.get('document_type_indicators', {})
+                    # Collect detected document types
+                    doc_type_indicators = extracted_metadata.get('text_analysis', {}).get('document_type_indicators', {})
                     if doc_type_indicators:
-                        likely_types = doc_type_indicators.get('likely_types', [])
-                        for doc_type in likely_types:
-                            aggregated_metadata['extraction_summary']['schemas_applied'].add(doc_type)
+                        all_types.extend(doc_type_indicators.get('likely_types', ()))
+            
+            # Count document types in one pass over the collected list
+            type_counts = Counter(all_types)
             
             # Calculate averages and limits
             aggregated_metadata['content_insights']['total_text_length'] = total_text_length
             aggregated_metadata['content_insights']['average_chunk_length'] = total_text_length / len(processed_chunks) if processed_chunks else 0
             
             # Limit and deduplicate aggregated data
-            aggregated_metadata['key_entities'] = self._deduplicate_entities(all_entities)[:20]  # Top 20 entities
+            aggregated_metadata['key_entities'] = self._deduplicate_entities(all_entities, limit=20)  # Top 20 entities
             aggregated_metadata['content_insights']['document_sections'] = all_sections[:10]  # Top 10 sections
             aggregated_metadata['content_insights']['action_items'] = all_action_items[:10]  # Top 10 action items
             
             # Update extraction summary
             aggregated_metadata['extraction_summary']['successful_extractions'] = successful_extractions
             aggregated_metadata['extraction_summary']['failed_extractions'] = len(processed_chunks) - successful_extractions
-            aggregated_metadata['extraction_summary']['schemas_applied'] = list(aggregated_metadata['extraction_summary']['schemas_applied'])
-            
-            # Determine primary document type
-            if aggregated_metadata['extraction_summary']['schemas_applied']:
-                # Use the most frequently detected document type
-                type_counts = {}
-                for chunk in processed_chunks:
-                    extracted_metadata = chunk.get('extracted_metadata', {})
-                    text_analysis = extracted_metadata.get('text_analysis', {})
-                    doc_type_indicators = text_analysis.get('document_type_indicators', {})
-                    likely_types = doc_type_indicators.get('likely_types', [])
-                    for doc_type in likely_types:
-                        type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-                
-                if type_counts:
-                    primary_type = max(type_counts.items(), key=lambda x: x[1])[0]
-                    aggregated_metadata['document_type_indicators']['primary_type'] = primary_type
-                    aggregated_metadata['document_type_indicators']['confidence_scores'] = type_counts
+            aggregated_metadata['extraction_summary']['schemas_applied'] = list(type_counts)
+            
+            # Use the most frequently detected document type as the primary type
+            if type_counts:
+                aggregated_metadata['document_type_indicators']['primary_type'] = type_counts.most_common(1)[0][0]
+                aggregated_metadata['document_type_indicators']['confidence_scores'] = dict(type_counts)
             
             logger.info(f"Aggregated metadata from {len(processed_chunks)} chunks")
             return aggregated_metadata
@@ -520,48 +737,94 @@ class DocumentProcessor:
             logger.error(f"Failed to aggregate document metadata: {e}")
             return {'error': str(e), 'total_chunks': len(processed_chunks)}
     
-    def _deduplicate_entities(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Deduplicate entities based on text content."""
-        seen_entities = set()
-        deduplicated = []
+    def _deduplicate_entities(self, entities: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Deduplicate entities based on text content, keeping the first of each in order.
+        
+        Stops once limit distinct entities have been found.
+        """
+        deduplicated = {}
         
         for entity in entities:
             entity_text = entity.get('text', '').lower().strip()
-            if entity_text and entity_text not in seen_entities:
-                seen_entities.add(entity_text)
-                deduplicated.append(entity)
+            if entity_text:
+                deduplicated.setdefault(entity_text, entity)
+                if len(deduplicated) == limit:
+                    break
         
-        return deduplicated
+        return list(deduplicated.values())
     
-    async def _generate_embeddings(self, text: str) -> Dict[str, List[float]]:
-        """Generate embeddings for text content."""
+    async def _generate_embeddings_batch(self, texts: List[str]) -> List[Dict[str, List[float]]]:
+        """Generate embeddings for several texts, returning {} for each text that failed."""
         try:
             if not openai_client.is_available():
                 logger.warning("OpenAI client not available, skipping embeddings")
-                return {}
-            
-            # Generate main text embedding
-            text_embedding = openai_client.generate_embedding(text)
-            
-            # Validate embedding
-            if not text_embedding or len(text_embedding) == 0:
-                logger.warning("Generated embedding is empty, skipping")
-                return {}
-            
-            # Ensure embedding has the expected dimension (1536 for text-embedding-3-small)
-            if len(text_embedding) != 1536:
-                logger.warning(f"Embedding dimension mismatch: expected 1536, got {len(text_embedding)}")
-                return {}
-            
-            embeddings = {
-                'text': text_embedding
-            }
+                return [{} for _ in texts]
+            
+            # Only distinct, non-blank texts without a cached embedding are sent to the API
+            keys = [_embedding_cache_key(text) if text.strip() else None for text in texts]
+            cached = cache_get_many([key for key in keys if key])
+            missing = {key: text for key, text in zip(keys, texts) if key and key not in cached}
+            
+            skipped = len(texts) - len(missing)
+            if skipped:
+                logger.info(f"Embedding {len(missing)} of {len(texts)} texts; "
+                            f"{skipped} are blank, repeated or cached")
+            
+            if missing:
+                # Generate main text embeddings (blocking HTTP calls) off the event loop
+                loop = asyncio.get_running_loop()
+                text_embeddings = await loop.run_in_executor(
+                    None, openai_client.generate_embeddings_batch, list(missing.values())
+                )
+                
+                generated = {}
+                for key, text_embedding in zip(missing, text_embeddings):
+                    embeddings = self._validate_embedding(text_embedding)
+                    if embeddings:
+                        generated[key] = embeddings
+                cache_set_many(generated, EMBEDDING_CACHE_TTL)
+                cached.update(generated)
             
-            return embeddings
+            return [cached.get(key, {}) for key in keys]
             
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
+            return [{} for _ in texts]
+    
+    @staticmethod
+    def _validate_embedding(text_embedding: Optional[List[float]]) -> Dict[str, List[float]]:
+        """Wrap a valid text embedding as {'text': embedding}, or return {} if it is unusable."""
+        # Validate embedding
+        if not text_embedding:
+            logger.warning("Generated embedding is empty, skipping")
+            return {}
+        
+        # Ensure embedding has the expected dimension (1536 for text-embedding-3-small)
+        if len(text_embedding) != 1536:
+            logger.warning(f"Embedding dimension mismatch: expected 1536, got {len(text_embedding)}")
             return {}
+        
+        return {
+            'text': text_embedding
+        }
+    
+    async def _execute_with_retry(self, query, description: str, idempotent: bool = True):
+        """
+        Execute a (blocking) Supabase query in a thread, retrying transient errors with
+        exponential backoff.
+        
+        Other errors, such as constraint and type errors, are raised at once.
+        """
+        for attempt in range(STORAGE_MAX_ATTEMPTS):
+            try:
+                return await asyncio.to_thread(query.execute)
+            except Exception as e:
+                if attempt == STORAGE_MAX_ATTEMPTS - 1 or not _is_transient_error(e, idempotent):
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"Failed to {description} (attempt {attempt + 1}/{STORAGE_MAX_ATTEMPTS}), "
+                               f"retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
     
     async def _store_processed_chunks(self, chunks: List[Dict[str, Any]], document_id: str, user_id: str):
         """Store processed chunks in database."""
@@ -570,8 +833,6 @@ class DocumentProcessor:
                 logger.warning("Supabase not available, skipping chunk storage")
                 return
             
-            client = supabase_client.get_client()
-            
             # Prepare data for batch insert
             chunk_records = []
             for chunk in chunks:
@@ -591,8 +852,9 @@ class DocumentProcessor:
                     'chunk_index': chunk['chunk_index'],
                     'content': chunk['content'],
                     'content_type': chunk['content_type'],
-                    'embedding': text_embedding,
-                    'all_embeddings': chunk['embeddings'],
+                    'embedding': _vector_literal(text_embedding),
+                    # The text vector is already in 'embedding'; only store any other embeddings
+                    'all_embeddings': {k: v for k, v in chunk['embeddings'].items() if k != 'text'} or None,
                     'extracted_metadata': chunk['extracted_metadata'],
                     'chunk_metadata': chunk['chunk_metadata']
                 }
@@ -600,7 +862,11 @@ class DocumentProcessor:
             
             # Batch insert only if we have valid chunks
             if chunk_records:
-                response = client.table('langextract_processed_embeddings').insert(chunk_records).execute()
+                client = supabase_client.get_client()
+                response = await self._execute_with_retry(
+                    client.table('langextract_processed_embeddings').insert(chunk_records),
+                    f"store {len(chunk_records)} chunks", idempotent=False
+                )
                 
                 if response.data:
                     logger.info(f"Stored {len(chunk_records)} chunks for document {document_id}")
@@ -623,20 +889,26 @@ class DocumentProcessor:
             
             client = supabase_client.get_client()
             
+            now = _now_iso()
             update_data = {
                 'processing_status': status,
-                'updated_at': datetime.utcnow().isoformat()
+                'updated_at': now
             }
             
             if status == 'completed':
-                update_data['processed_at'] = datetime.utcnow().isoformat()
+                update_data['processed_at'] = now
                 # Update metadata if provided
                 if metadata:
                     update_data['metadata'] = metadata
             elif status == 'failed' and error:
                 update_data['processing_error'] = error
             
-            response = client.table('langextract_documents').update(update_data).eq('id', document_id).execute()
+            response = await self._execute_with_retry(
+                client.table('langextract_documents').update(update_data).eq('id', document_id),
+                f"update document {document_id} status"
+            )
+            cache_delete(_document_status_cache_key(document_id))
+            _invalidate_document_lists()
             
             if response.data:
                 logger.info(f"Updated document {document_id} status to {status}")
@@ -654,10 +926,16 @@ class DocumentProcessor:
             if not supabase_client.is_available():
                 return None
             
+            cache_key = _document_status_cache_key(document_id)
+            cached = cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
             client = supabase_client.get_client()
             response = client.table('langextract_documents').select('*').eq('id', document_id).execute()
             
             if response.data:
+                cache_set(cache_key, response.data[0], DOCUMENT_STATUS_CACHE_TTL)
                 return response.data[0]
             else:
                 return None
@@ -672,10 +950,17 @@ class DocumentProcessor:
             if not supabase_client.is_available():
                 return []
             
+            cache_key = _document_list_cache_key(limit, offset)
+            cached = cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
             client = supabase_client.get_client()
-            response = client.table('langextract_documents').select('*').order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            response = client.table('langextract_documents').select(DOCUMENT_LIST_COLUMNS).order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
-            return response.data or []
+            documents = response.data or []
+            cache_set(cache_key, documents, DOCUMENT_LIST_CACHE_TTL)
+            return documents
             
         except Exception as e:
             logger.error(f"Failed to list documents: {e}")
@@ -694,6 +979,8 @@ class DocumentProcessor:
             
             # Delete document
             response = client.table('langextract_documents').delete().eq('id', document_id).execute()
+            cache_delete(_document_status_cache_key(document_id))
+            _invalidate_document_lists()
             
             if response.data:
                 logger.info(f"Deleted document {document_id}")
@@ -20,43 +20,32 @@ def check_documents_table():
         print("❌ Supabase client not available")
         return False
     
-    client = supabase_client.get_client()
-    
     try:
-        # Try to get the table structure by selecting from it
-        result = client.table('documents').select('*').limit(1).execute()
-        print("✅ Documents table exists and is accessible")
+        # Read all column names in one call (function from db/migrations/007)
+        existing_columns = supabase_client.get_table_columns('documents')
+        
+        if not existing_columns:
+            print("❌ Documents table not found")
+            return None
         
-        # Check what columns exist by trying to insert a test record
-        test_data = {
-            'filename': 'test.txt',
-            'original_filename': 'test.txt',
-            'file_type': 'txt',
-            'file_size': 100,
-            'file_path': '/tmp/test.txt',
-            'upload_status': 'uploaded',
-            'processing_status': 'pending'
-        }
+        print("✅ Documents table exists and is accessible")
         
         print("🔍 Checking required columns...")
         missing_columns = []
         
-        # Test each column
+        # Compare the required columns against the table's columns
         for column in ['filename', 'original_filename', 'file_type', 'file_size', 'file_path', 'upload_status', 'processing_status']:
-            try:
-                test_result = client.table('documents').insert({column: test_data[column]}).execute()
+            if column in existing_columns:
                 print(f"   ✅ Column '{column}' exists")
-            except Exception as e:
-                if 'column' in str(e).lower() and 'does not exist' in str(e).lower():
-                    print(f"   ❌ Column '{column}' is missing")
-                    missing_columns.append(column)
-                else:
-                    print(f"   ✅ Column '{column}' exists (other error: {str(e)[:50]}...)")
+            else:
+                print(f"   ❌ Column '{column}' is missing")
+                missing_columns.append(column)
         
         return missing_columns
         
     except Exception as e:
         print(f"❌ Error checking documents table: {e}")
+        print("   Make sure db/migrations/007_add_get_table_columns_function.sql has been applied")
         return None
 
 def fix_documents_table():
@@ -67,17 +56,21 @@ def fix_documents_table():
     print("=" * 60)
     
     sql_statements = [
-        "-- Add missing columns to documents table",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS filename VARCHAR(500);",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS original_filename VARCHAR(500);",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_type VARCHAR(50);",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_size BIGINT;",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_path TEXT;",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS upload_status VARCHAR(50) DEFAULT 'uploaded';",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_status VARCHAR(50) DEFAULT 'pending';",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_error TEXT;",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE;",
-        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}';",
+        "-- Add missing columns and indexes in one transaction",
+        "BEGIN;",
+        "",
+        "-- One ALTER TABLE takes the table lock once for all columns",
+        "ALTER TABLE documents",
+        "    ADD COLUMN IF NOT EXISTS filename VARCHAR(500),",
+        "    ADD COLUMN IF NOT EXISTS original_filename VARCHAR(500),",
+        "    ADD COLUMN IF NOT EXISTS file_type VARCHAR(50),",
+        "    ADD COLUMN IF NOT EXISTS file_size BIGINT,",
+        "    ADD COLUMN IF NOT EXISTS file_path TEXT,",
+        "    ADD COLUMN IF NOT EXISTS upload_status VARCHAR(50) DEFAULT 'uploaded',",
+        "    ADD COLUMN IF NOT EXISTS processing_status VARCHAR(50) DEFAULT 'pending',",
+        "    ADD COLUMN IF NOT EXISTS processing_error TEXT,",
+        "    ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE,",
+        "    ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}';",
         "",
         "-- Add indexes for better performance",
         "CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents(filename);",
@@ -91,14 +84,16 @@ def fix_documents_table():
         "COMMENT ON TABLE documents IS 'Table for tracking uploaded documents and their processing status';",
         "COMMENT ON COLUMN documents.file_path IS 'Path to the stored file in the file system or cloud storage';",
         "COMMENT ON COLUMN documents.upload_status IS 'Status of file upload: uploaded, processing, completed, failed';",
-        "COMMENT ON COLUMN documents.processing_status IS 'Status of document processing: pending, processing, completed, failed';"
+        "COMMENT ON COLUMN documents.processing_status IS 'Status of document processing: pending, processing, completed, failed';",
+        "",
+        "COMMIT;"
     ]
     
     for statement in sql_statements:
         print(statement)
     
     print("=" * 60)
-    print("Copy the above SQL statements and run them in your Supabase SQL Editor.")
+    print("Copy the above SQL and run it in your Supabase SQL Editor as a single script.")
 
 if __name__ == "__main__":
     print("🚀 Documents Table Structure Checker")
@@ -7,17 +7,20 @@ FROM information_schema.columns
 WHERE table_name = 'documents' 
 ORDER BY ordinal_position;
 
--- Add any missing columns to documents table
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS filename VARCHAR(500);
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS original_filename VARCHAR(500);
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_type VARCHAR(50);
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_size BIGINT;
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS file_path TEXT;
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS upload_status VARCHAR(50) DEFAULT 'uploaded';
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_status VARCHAR(50) DEFAULT 'pending';
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_error TEXT;
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE;
-ALTER TABLE documents ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}';
+BEGIN;
+
+-- Add any missing columns to documents table (one ALTER TABLE takes the table lock once)
+ALTER TABLE documents
+    ADD COLUMN IF NOT EXISTS filename VARCHAR(500),
+    ADD COLUMN IF NOT EXISTS original_filename VARCHAR(500),
+    ADD COLUMN IF NOT EXISTS file_type VARCHAR(50),
+    ADD COLUMN IF NOT EXISTS file_size BIGINT,
+    ADD COLUMN IF NOT EXISTS file_path TEXT,
+    ADD COLUMN IF NOT EXISTS upload_status VARCHAR(50) DEFAULT 'uploaded',
+    ADD COLUMN IF NOT EXISTS processing_status VARCHAR(50) DEFAULT 'pending',
+    ADD COLUMN IF NOT EXISTS processing_error TEXT,
+    ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}';
 
 -- Add indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents(filename);
@@ -33,6 +36,8 @@ COMMENT ON COLUMN documents.file_path IS 'Path to the stored file in the file sy
 COMMENT ON COLUMN documents.upload_status IS 'Status of file upload: uploaded, processing, completed, failed';
 COMMENT ON COLUMN documents.processing_status IS 'Status of document processing: pending, processing, completed, failed';
 
+COMMIT;
+
 -- Verify the final structure
 SELECT column_name, data_type, is_nullable, column_default 
 FROM information_schema.columns 
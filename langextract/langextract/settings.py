@@ -2,23 +2,21 @@
 Django settings for langextract project.
 """
 
-import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from core.env import env
+from core.config import CONFIG
+from django.utils.functional import SimpleLazyObject
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'django-insecure-change-me-in-production')
+SECRET_KEY = CONFIG.secret_key
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+DEBUG = CONFIG.debug
 
-ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+ALLOWED_HOSTS = CONFIG.allowed_hosts
 
 # Application definition
 INSTALLED_APPS = [
@@ -38,7 +36,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware should be at the top
-    'core.middleware.StatelessMiddleware',
+    'django.middleware.gzip.GZipMiddleware',  # Compress responses for clients that accept gzip
+    'core.middleware.GzipRequestMiddleware',  # Accept gzip-encoded request bodies
     'django.middleware.common.CommonMiddleware',
 ]
 
@@ -81,16 +80,41 @@ STATICFILES_DIRS = []
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache - Redis when REDIS_URL is set, otherwise per-process memory
+REDIS_URL = env('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Migrations - Not needed for stateless API service
 MIGRATION_MODULES = {}
 
+# JSON (de)serialization - use orjson when installed
+try:
+    import orjson  # noqa: F401
+    JSON_RENDERER_CLASS = 'core.renderers.ORJSONRenderer'
+    JSON_PARSER_CLASS = 'core.renderers.ORJSONParser'
+except ImportError:
+    JSON_RENDERER_CLASS = 'rest_framework.renderers.JSONRenderer'
+    JSON_PARSER_CLASS = 'rest_framework.parsers.JSONParser'
+
 # REST Framework settings - Minimal configuration
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        JSON_RENDERER_CLASS,
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        JSON_PARSER_CLASS,
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
@@ -101,14 +125,14 @@ REST_FRAMEWORK = {
 }
 
 # OpenAI Configuration
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'text-embedding-3-small')
-MAX_TOKENS_PER_REQUEST = int(os.getenv('MAX_TOKENS_PER_REQUEST', '8000'))
+OPENAI_API_KEY = CONFIG.openai_api_key
+OPENAI_MODEL = CONFIG.openai_model
+MAX_TOKENS_PER_REQUEST = CONFIG.max_tokens_per_request
 
 # Supabase Configuration
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
-SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+SUPABASE_URL = env('SUPABASE_URL')
+SUPABASE_ANON_KEY = env('SUPABASE_ANON_KEY')
+SUPABASE_SERVICE_ROLE_KEY = env('SUPABASE_SERVICE_ROLE_KEY')
 
 # Vector Storage Configuration
 VECTOR_STORAGE_ENABLED = bool(SUPABASE_URL and SUPABASE_ANON_KEY)
@@ -145,7 +169,7 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # Allow all origins in development (optional - for testing)
-CORS_ALLOW_ALL_ORIGINS = os.getenv('CORS_ALLOW_ALL_ORIGINS', 'False').lower() == 'true'
+CORS_ALLOW_ALL_ORIGINS = CONFIG.cors_allow_all_origins
 
 # CORS settings for credentials
 CORS_ALLOW_CREDENTIALS = True
@@ -164,20 +188,17 @@ CORS_ALLOW_HEADERS = [
     'x-user-id',  # Custom header for user identification
 ]
 
-# Initialize vector storage service
-try:
-    from core.vector_storage import VectorStorage
-    from core.supabase_client import SupabaseClient
-    
-    # Initialize Supabase client
-    supabase_client = SupabaseClient()
-    
-    # Initialize vector storage
-    vector_storage = VectorStorage()
-    
-except ImportError as e:
-    print(f"Warning: Could not import vector storage modules: {e}")
-    vector_storage = None
-except Exception as e:
-    print(f"Warning: Could not initialize vector storage: {e}")
-    vector_storage = None
+# Vector storage service - resolved on first use to the shared instances in core,
+# so settings never builds a second Supabase client
+def _get_supabase_client():
+    from core.supabase_client import supabase_client
+    return supabase_client
+
+
+def _get_vector_storage():
+    from core.vector_storage import vector_storage
+    return vector_storage
+
+
+supabase_client = SimpleLazyObject(_get_supabase_client)
+vector_storage = SimpleLazyObject(_get_vector_storage)
@@ -2,17 +2,13 @@
 Supabase configuration settings for the langextract project.
 """
 
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from core.env import env
 
 # Supabase Configuration
 SUPABASE_CONFIG = {
-    'url': os.getenv('SUPABASE_URL'),
-    'anon_key': os.getenv('SUPABASE_ANON_KEY'),
-    'service_role_key': os.getenv('SUPABASE_SERVICE_ROLE_KEY'),
+    'url': env('SUPABASE_URL'),
+    'anon_key': env('SUPABASE_ANON_KEY'),
+    'service_role_key': env('SUPABASE_SERVICE_ROLE_KEY'),
 }
 
 # Vector Database Configuration
@@ -25,11 +21,11 @@ VECTOR_CONFIG = {
 
 # Database Connection Settings
 DB_CONFIG = {
-    'host': os.getenv('SUPABASE_DB_HOST'),
-    'port': os.getenv('SUPABASE_DB_PORT', '5432'),
-    'database': os.getenv('SUPABASE_DB_NAME'),
-    'user': os.getenv('SUPABASE_DB_USER'),
-    'password': os.getenv('SUPABASE_DB_PASSWORD'),
+    'host': env('SUPABASE_DB_HOST'),
+    'port': env('SUPABASE_DB_PORT', '5432'),
+    'database': env('SUPABASE_DB_NAME'),
+    'user': env('SUPABASE_DB_USER'),
+    'password': env('SUPABASE_DB_PASSWORD'),
 }
 
 # Validation
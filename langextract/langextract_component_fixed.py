@@ -7,10 +7,15 @@ and process document chunks using the LangExtract API.
 Copy and paste this entire code into Langflow's custom component editor.
 """
 
+import gzip
 import json
+import sys
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -19,6 +24,147 @@ from langflow.custom import Component
 from langflow.io import DropdownInput, HandleInput, BoolInput, FloatInput, IntInput, StrInput, Output
 from langflow.schema import Data, DataFrame
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Documents per /api/process/ request and concurrent requests per component
+BATCH_SIZE = 32
+MAX_CONCURRENCY = 16
+MAX_RETRIES = 3
+
+# /api/process/ stores embeddings, so a batch is only resent for statuses where the
+# server did not process it: rate limiting, and 503 when it says when to retry
+RETRY_STATUS_CODES = (429, 503)
+MAX_RETRY_DELAY = 60
+
+# Schemas accepted by the LangExtract API, in display order
+_SCHEMA_NAMES = (
+    "support_case", "refund_case", "invoice", "contract_terms",
+    "sop_steps", "price_list", "product_spec", "faq", "policy"
+)
+_AVAILABLE_SCHEMAS = frozenset(_SCHEMA_NAMES)
+
+_RECOMMENDED_COMBOS = (
+    ("invoice",),  # Invoice processing
+    ("support_case",),  # Support ticket processing
+    ("refund_case",),  # Refund processing
+    ("product_spec",),  # Product specification
+    ("contract_terms",),  # Contract analysis
+    ("policy",),  # Policy document processing
+    ("invoice", "support_case"),  # Invoice + support combination
+    ("refund_case", "support_case"),  # Refund + support combination
+    ("product_spec", "price_list"),  # Product + pricing combination
+)
+
+# Chunk fields that may hold the text content, in lookup order
+_TEXT_FIELDS = ('text', 'content', 'page_content', 'document_text')
+_TEXT_FIELD_SET = frozenset(_TEXT_FIELDS)
+_TEXT_ATTRS = ('text', 'page_content')
+
+# Chunk fields that may hold the document and chunk IDs, in lookup order
+_DOC_ID_KEYS = ('document_id', 'doc_id', 'document_name')
+_CHUNK_ID_KEYS = ('chunk_id', 'id', 'chunk_index')
+
+_MISSING = object()
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+GZIP_JSON_HEADERS = {**JSON_HEADERS, 'Content-Encoding': 'gzip'}
+
+# Bodies below this size fit in a packet or two, where compressing costs more than it saves
+GZIP_MIN_BYTES = 1500
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request payload to JSON bytes, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _encode_body(payload: Dict[str, Any], compress: bool = False) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize a request payload, gzip-compressing it when asked and not small.
+    
+    Only compress for servers that accept gzip request bodies (GzipRequestMiddleware).
+    """
+    body = _dumps(payload)
+    if not compress or len(body) < GZIP_MIN_BYTES:
+        return body, JSON_HEADERS
+    return gzip.compress(body, compresslevel=1), GZIP_JSON_HEADERS
+
+
+def _loads(content: bytes) -> Any:
+    """Parse a JSON response body, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _intern_id(value: Any) -> str:
+    """Stringify and intern an ID; many chunks share one document_id."""
+    return sys.intern(value if type(value) is str else str(value))
+
+
+def _first_item(chunk: Dict[str, Any], keys) -> Any:
+    """Return the first non-empty value among keys in a dict chunk, or None."""
+    for key in keys:
+        value = chunk.get(key)
+        if value:
+            return value
+    return None
+
+
+def _first_attr(chunk: Any, names) -> Any:
+    """Return the first attribute among names that a chunk object has, or _MISSING."""
+    for name in names:
+        value = getattr(chunk, name, _MISSING)
+        if value is not _MISSING:
+            return value
+    return _MISSING
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before resending a batch after response, or None to not resend it."""
+    retry_after = response.headers.get('Retry-After')
+    if response.status_code == 429 or (response.status_code == 503 and retry_after):
+        try:
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        except (TypeError, ValueError):
+            # Missing, or an HTTP date
+            return 2 ** attempt
+    return None
+
+
+def _create_session() -> requests.Session:
+    """Create a pooled requests session with retry logic."""
+    session = requests.Session()
+    
+    # Configure retry strategy
+    retry_strategy = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=RETRY_STATUS_CODES,
+    )
+    
+    adapter = HTTPAdapter(pool_connections=50, pool_maxsize=100, max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every client so repeated calls reuse pooled keep-alive connections
+_SESSION = _create_session()
+
 
 @dataclass
 class DocumentChunk:
@@ -69,17 +215,7 @@ class LangExtractComponent(Component):
         DropdownInput(
             name="schemas",
             display_name="Schemas",
-            options=[
-                "support_case",
-                "refund_case", 
-                "invoice",
-                "contract_terms",
-                "sop_steps",
-                "price_list",
-                "product_spec",
-                "faq",
-                "policy"
-            ],
+            options=list(_SCHEMA_NAMES),
             info="Schemas to apply for processing (you can select multiple by separating with commas)",
             value="invoice",
             required=True,
@@ -112,13 +248,21 @@ class LangExtractComponent(Component):
             value=30,
             required=False,
         ),
+        BoolInput(
+            name="compress_requests",
+            display_name="Compress Requests",
+            info="Gzip request bodies; the API server must accept gzip-encoded requests",
+            value=False,
+            required=False,
+            advanced=True,
+        ),
     ]
 
     outputs = [
         Output(display_name="API Response", name="api_response", method="process_chunks"),
     ]
 
-    def process_chunks(self) -> Data:
+    async def process_chunks(self) -> Data:
         """
         Process Dokling document chunks using the LangExtract API.
         
@@ -159,10 +303,11 @@ class LangExtractComponent(Component):
         
         # Create client and process documents
         try:
-            client = self._create_client(self.api_url, self.timeout)
+            client = self._create_client(self.api_url, self.timeout, self.compress_requests)
             
-            # Process documents
-            result = self._process_documents(client, documents, schemas_list, options)
+            # Process documents; the client's connections belong to this run's event loop
+            async with client['session']:
+                result = await self._process_documents(client, documents, schemas_list, options)
             
             # Return the raw API response for pipeline integration
             return Data(data=result)
@@ -182,14 +327,9 @@ class LangExtractComponent(Component):
             schemas = [str(schemas_input)]
         
         # Validate schemas
-        available_schemas = [
-            "support_case", "refund_case", "invoice", "contract_terms",
-            "sop_steps", "price_list", "product_spec", "faq", "policy"
-        ]
-        
-        valid_schemas = [s for s in schemas if s in available_schemas]
+        valid_schemas = [s for s in schemas if s in _AVAILABLE_SCHEMAS]
         if not valid_schemas:
-            raise ValueError(f"No valid schemas found. Available: {available_schemas}")
+            raise ValueError(f"No valid schemas found. Available: {list(_SCHEMA_NAMES)}")
         
         return valid_schemas
     
@@ -199,8 +339,6 @@ class LangExtractComponent(Component):
         
         FIXED: Now properly handles multiple chunks from the same document
         """
-        documents = []
-        
         try:
             # Handle different possible Dokling data structures
             chunks_data = self._extract_chunks_from_dokling_output(dokling_data)
@@ -210,89 +348,63 @@ class LangExtractComponent(Component):
             
             logging.info(f"Found {len(chunks_data)} chunks in Dokling output")
             
-            # Group chunks by document (if they have document_id)
-            document_chunks = {}
-            orphan_chunks = []
-            
-            for i, chunk in enumerate(chunks_data):
-                # Extract text content from chunk
-                text = self._extract_text_from_chunk(chunk)
-                
-                if text and text.strip():
-                    # Try to extract document_id from chunk metadata
-                    document_id = self._extract_document_id_from_chunk(chunk, i)
-                    chunk_id = self._extract_chunk_id_from_chunk(chunk, i)
-                    
-                    # Extract metadata
-                    metadata = self._extract_metadata_from_chunk(chunk)
-                    
-                    chunk_data = {
-                        'text': text.strip(),
-                        'document_id': document_id,
-                        'chunk_id': chunk_id,
-                        'metadata': metadata
-                    }
-                    
-                    # Group by document_id
-                    if document_id in document_chunks:
-                        document_chunks[document_id].append(chunk_data)
-                    else:
-                        document_chunks[document_id] = [chunk_data]
+            # Keep chunks with non-blank text
+            extracted = (self._extract_all(chunk, i) for i, chunk in enumerate(chunks_data))
+            documents = [
+                DocumentChunk(
+                    text=text,
+                    document_id=document_id,
+                    chunk_id=chunk_id,
+                    metadata=metadata
+                )
+                for raw_text, document_id, chunk_id, metadata in extracted
+                if (text := raw_text.strip())
+            ]
             
-            # Convert grouped chunks to DocumentChunk objects
-            for doc_id, chunks in document_chunks.items():
-                for chunk_data in chunks:
-                    documents.append(DocumentChunk(
-                        text=chunk_data['text'],
-                        document_id=chunk_data['document_id'],
-                        chunk_id=chunk_data['chunk_id'],
-                        metadata=chunk_data['metadata']
-                    ))
-            
-            logging.info(f"Extracted {len(documents)} valid chunks from {len(document_chunks)} documents")
+            document_count = len({doc.document_id for doc in documents})
+            logging.info(f"Extracted {len(documents)} valid chunks from {document_count} documents")
             return documents
             
         except Exception as e:
             logging.error(f"Error extracting Dokling chunks: {e}")
             raise ValueError(f"Failed to extract chunks from Dokling data: {e}")
     
-    def _extract_document_id_from_chunk(self, chunk: Any, index: int) -> str:
-        """Extract or generate document_id from chunk."""
-        
-        if isinstance(chunk, dict):
-            # Try to get document_id from chunk metadata
-            doc_id = chunk.get('document_id') or chunk.get('doc_id') or chunk.get('document_name')
-            if doc_id:
-                return str(doc_id)
-        
-        elif hasattr(chunk, 'document_id'):
-            return str(chunk.document_id)
-        elif hasattr(chunk, 'doc_id'):
-            return str(chunk.doc_id)
-        elif hasattr(chunk, 'document_name'):
-            return str(chunk.document_name)
-        
-        # If no document_id found, use a default one
-        return "default_document"
-    
-    def _extract_chunk_id_from_chunk(self, chunk: Any, index: int) -> str:
-        """Extract or generate chunk_id from chunk."""
+    def _extract_all(self, chunk: Any, index: int) -> Tuple[str, str, str, Dict[str, Any]]:
+        """
+        Extract text, document_id, chunk_id and metadata from a chunk in one pass.
         
+        Missing IDs default to "default_document" and chunk_<index>; text falls
+        back to the chunk's string form.
+        """
         if isinstance(chunk, dict):
-            # Try to get chunk_id from chunk metadata
-            chunk_id = chunk.get('chunk_id') or chunk.get('id') or chunk.get('chunk_index')
-            if chunk_id:
-                return str(chunk_id)
-        
-        elif hasattr(chunk, 'chunk_id'):
-            return str(chunk.chunk_id)
-        elif hasattr(chunk, 'id'):
-            return str(chunk.id)
-        elif hasattr(chunk, 'chunk_index'):
-            return str(chunk.chunk_index)
+            text = _first_item(chunk, _TEXT_FIELDS)
+            document_id = _first_item(chunk, _DOC_ID_KEYS)
+            chunk_id = _first_item(chunk, _CHUNK_ID_KEYS)
+            metadata = {
+                key: value for key, value in chunk.items()
+                if key not in _TEXT_FIELD_SET and value is not None
+            }
+            return (
+                str(text if text else chunk),
+                _intern_id(document_id) if document_id else "default_document",
+                str(chunk_id) if chunk_id else f"chunk_{index:03d}",
+                metadata
+            )
         
-        # If no chunk_id found, generate one
-        return f"chunk_{index:03d}"
+        text = _first_attr(chunk, _TEXT_ATTRS)
+        document_id = _first_attr(chunk, _DOC_ID_KEYS)
+        chunk_id = _first_attr(chunk, _CHUNK_ID_KEYS)
+        attributes = getattr(chunk, '__dict__', None)
+        metadata = {} if attributes is None else {
+            key: value for key, value in attributes.items()
+            if not key.startswith('_') and value is not None
+        }
+        return (
+            str(chunk if text is _MISSING else text),
+            "default_document" if document_id is _MISSING else _intern_id(document_id),
+            f"chunk_{index:03d}" if chunk_id is _MISSING else str(chunk_id),
+            metadata
+        )
     
     def _extract_chunks_from_dokling_output(self, dokling_data) -> List[Any]:
         """Extract chunks from various Dokling output formats."""
@@ -317,115 +429,125 @@ class LangExtractComponent(Component):
         else:
             return [dokling_data]
     
-    def _extract_text_from_chunk(self, chunk: Any) -> str:
-        """Extract text content from a chunk object."""
-        
-        if isinstance(chunk, dict):
-            # Try different possible text field names
-            text_fields = ['text', 'content', 'page_content', 'document_text']
-            for field in text_fields:
-                if field in chunk and chunk[field]:
-                    return str(chunk[field])
-            
-            # If no text field found, try to convert the whole chunk
-            return str(chunk)
-        
-        elif hasattr(chunk, 'text'):
-            # Handle object with text attribute
-            return str(chunk.text)
-        
-        elif hasattr(chunk, 'page_content'):
-            # Handle object with page_content attribute
-            return str(chunk.page_content)
-        
-        else:
-            # Handle string or other types
-            return str(chunk)
-    
-    def _extract_metadata_from_chunk(self, chunk: Any) -> Dict[str, Any]:
-        """Extract metadata from a chunk object."""
-        
-        metadata = {}
-        
-        if isinstance(chunk, dict):
-            # Copy relevant fields as metadata, excluding text fields
-            text_fields = ['text', 'content', 'page_content', 'document_text']
-            for key, value in chunk.items():
-                if key not in text_fields and value is not None:
-                    metadata[key] = value
-        
-        elif hasattr(chunk, '__dict__'):
-            # Handle object attributes
-            for key, value in chunk.__dict__.items():
-                if not key.startswith('_') and value is not None:
-                    metadata[key] = value
-        
-        return metadata
-    
-    def _create_client(self, api_url: str, timeout: int):
-        """Create a requests session with retry logic."""
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+    def _create_client(self, api_url: str, timeout: int, compress: bool = False):
+        """Create an async HTTP client for one run; the caller must close client['session']."""
+        limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+        # The transport retries failed connects; _post_batch retries rate-limit statuses
+        http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=MAX_RETRIES, http2=HTTP2_AVAILABLE, limits=limits),
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
         return {
-            'session': session,
+            'session': http_client,
             'base_url': api_url.rstrip('/'),
-            'timeout': timeout
+            # Batches queue for a pooled connection, so only bound the request itself
+            'timeout': httpx.Timeout(timeout, pool=None),
+            'compress': compress
         }
     
-    def _process_documents(self, client, documents: List[DocumentChunk], schemas: List[str], options: ProcessingOptions) -> Dict[str, Any]:
-        """Process documents using the LangExtract API."""
+    async def _post_batch(self, client, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST one batch, resending it only when the server did not process it.
         
-        # Validate schemas
-        available_schemas = [
-            "support_case", "refund_case", "invoice", "contract_terms",
-            "sop_steps", "price_list", "product_spec", "faq", "policy"
-        ]
+        Other error statuses are raised rather than retried: the server may have
+        stored the batch before the error (e.g. a proxy timeout), and resending it
+        would store it twice.
+        """
+        body, headers = _encode_body(payload, client['compress'])
+        for attempt in range(MAX_RETRIES + 1):
+            response = await client['session'].post(
+                url, content=body, headers=headers, timeout=client['timeout']
+            )
+            delay = _retry_delay(response, attempt)
+            if delay is None or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(delay)
+        response.raise_for_status()
+        return _loads(response.content)
+    
+    @staticmethod
+    def _merge_into(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        """Merge one response dict into another: sum numbers, concatenate lists, recurse into dicts."""
+        for key, value in source.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                target[key] = target.get(key, 0) + value
+            elif isinstance(value, list):
+                target.setdefault(key, []).extend(value)
+            elif isinstance(value, dict):
+                LangExtractComponent._merge_into(target.setdefault(key, {}), value)
+            elif key == 'status' and value == 'error':
+                # A failed batch marks the merged result as failed
+                target[key] = value
+            else:
+                # Other values (status, messages) keep the first batch's value
+                target.setdefault(key, value)
+    
+    @staticmethod
+    def _merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-batch API responses into a single response.
         
-        invalid_schemas = [s for s in schemas if s not in available_schemas]
-        if invalid_schemas:
-            raise ValueError(f"Invalid schemas: {invalid_schemas}. Available: {available_schemas}")
+        processed_documents and list fields such as storage_results.stored_ids are
+        concatenated, counts such as summary.processed_chunks and
+        storage_results.successful are summed, an 'error' status from any batch wins,
+        and other values come from the first batch.
+        """
+        merged: Dict[str, Any] = {}
+        for result in results:
+            LangExtractComponent._merge_into(merged, result)
+        
+        summary = merged.get('summary')
+        if summary and 'total_processing_time' in summary:
+            summary['total_processing_time'] = round(summary['total_processing_time'], 3)
+        return merged
+    
+    async def _process_documents(self, client, documents: List[DocumentChunk], schemas: List[str], options: ProcessingOptions) -> Dict[str, Any]:
+        """
+        Process documents using the LangExtract API.
         
-        # Prepare request payload
-        payload = {
-            "documents": [asdict(doc) for doc in documents],
-            "schemas": schemas
-        }
+        Expects schemas already validated by _parse_schemas. If a batch fails, the
+        batches still being sent are cancelled and the error is raised; batches the
+        server already accepted stay stored, so a failed run can be partially stored.
+        """
         
-        if options:
-            payload["options"] = asdict(options)
+        # Prepare one request payload per batch of documents; DocumentChunk and
+        # ProcessingOptions are flat, so their __dict__ serializes without asdict's deep copy
+        options_payload = vars(options) if options else None
+        payloads = []
+        doc_iter = iter(documents)
+        while batch := list(islice(doc_iter, BATCH_SIZE)):
+            payload = {
+                "documents": [vars(doc) for doc in batch],
+                "schemas": schemas
+            }
+            if options_payload:
+                payload["options"] = options_payload
+            payloads.append(payload)
         
         # Log the payload for debugging
         logging.info(f"Sending {len(documents)} documents to LangExtract API")
         logging.info(f"Document IDs: {[doc.document_id for doc in documents]}")
         logging.info(f"Chunk IDs: {[doc.chunk_id for doc in documents]}")
         
-        # Make API request
+        # Make API requests, one per batch, concurrently over the shared client
         url = f"{client['base_url']}/api/process/"
         
+        tasks = [asyncio.ensure_future(self._post_batch(client, url, p)) for p in payloads]
         try:
-            response = client['session'].post(
-                url,
-                json=payload,
-                timeout=client['timeout']
-            )
-            response.raise_for_status()
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # Don't keep sending (and storing) batches for a run that has failed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
             
-            result = response.json()
-            logging.info(f"Successfully processed {len(documents)} documents")
+            result = self._merge_results(results)
+            logging.info(f"Successfully processed {len(documents)} documents in {len(payloads)} batches")
             return result
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logging.error(f"API request failed: {e}")
             raise RuntimeError(f"Failed to communicate with LangExtract API: {e}")
         except json.JSONDecodeError as e:
@@ -436,21 +558,8 @@ class LangExtractComponent(Component):
 # Utility functions for standalone use
 def create_langextract_component(api_url: str = "https://langextract.ai-did-it.eu") -> Dict[str, Any]:
     """Factory function to create a LangExtract client instance."""
-    session = requests.Session()
-    
-    # Configure retry strategy
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
     return {
-        'session': session,
+        'session': _SESSION,
         'base_url': api_url.rstrip('/'),
         'timeout': 30
     }
@@ -460,9 +569,14 @@ def process_dokling_chunks(
     dokling_chunks: List[Any],
     schemas: List[str],
     api_url: str = "https://langextract.ai-did-it.eu",
-    options: Optional[ProcessingOptions] = None
+    options: Optional[ProcessingOptions] = None,
+    compress: bool = False
 ) -> Dict[str, Any]:
-    """Convenience function to process Dokling chunks directly."""
+    """
+    Convenience function to process Dokling chunks directly.
+    
+    Set compress only for servers that accept gzip-encoded request bodies.
+    """
     client = create_langextract_component(api_url)
     
     # Convert Dokling chunks to DocumentChunk format
@@ -494,22 +608,24 @@ def process_dokling_chunks(
     
     # Prepare payload
     payload = {
-        "documents": [asdict(doc) for doc in documents],
+        "documents": [vars(doc) for doc in documents],
         "schemas": schemas,
-        "options": asdict(options)
+        "options": vars(options)
     }
     
     # Make API request
     url = f"{client['base_url']}/api/process/"
     
     try:
+        body, headers = _encode_body(payload, compress)
         response = client['session'].post(
             url,
-            json=payload,
+            data=body,
+            headers=headers,
             timeout=client['timeout']
         )
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
         
     except Exception as e:
         logging.error(f"Error processing Dokling chunks: {e}")
@@ -527,17 +643,7 @@ def get_default_processing_options() -> ProcessingOptions:
 
 def get_recommended_schema_combinations() -> List[List[str]]:
     """Get recommended schema combinations for different use cases."""
-    return [
-        ["invoice"],  # Invoice processing
-        ["support_case"],  # Support ticket processing
-        ["refund_case"],  # Refund processing
-        ["product_spec"],  # Product specification
-        ["contract_terms"],  # Contract analysis
-        ["policy"],  # Policy document processing
-        ["invoice", "support_case"],  # Invoice + support combination
-        ["refund_case", "support_case"],  # Refund + support combination
-        ["product_spec", "price_list"],  # Product + pricing combination
-    ]
+    return [list(combo) for combo in _RECOMMENDED_COMBOS]
 
 
 if __name__ == "__main__":
@@ -550,11 +656,7 @@ if __name__ == "__main__":
     
     # Show available schemas
     print("\nAvailable schemas:")
-    schemas = [
-        "support_case", "refund_case", "invoice", "contract_terms",
-        "sop_steps", "price_list", "product_spec", "faq", "policy"
-    ]
-    for schema in schemas:
+    for schema in _SCHEMA_NAMES:
         print(f"  - {schema}")
     
     # Show recommended combinations
@@ -5,6 +5,7 @@ Reprocess the document with proper docling extraction.
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add the project root to Python path
@@ -21,6 +22,11 @@ from core.supabase_client import supabase_client
 from document_processor.processor import DocumentProcessor
 import asyncio
 
+@lru_cache(maxsize=1)
+def _get_processor() -> DocumentProcessor:
+    """Build the document processor once and reuse it across reprocessing runs."""
+    return DocumentProcessor()
+
 async def reprocess_document():
     """Reprocess the document with proper docling extraction."""
     
@@ -81,7 +87,7 @@ async def reprocess_document():
     # Reprocess the document
     print("🔄 Reprocessing document with docling...")
     try:
-        processor = DocumentProcessor()
+        processor = _get_processor()
         
         result = await processor.process_document(
             file_data=file_data,
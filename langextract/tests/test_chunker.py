@@ -0,0 +1,122 @@
+"""
+Tests for the document chunker module.
+"""
+
+import unittest
+from document_processor.chunker import DocumentChunker, ChunkConfig
+
+
+class TestDocumentChunker(unittest.TestCase):
+    """Test cases for DocumentChunker class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = ChunkConfig(max_chunk_size=200, min_chunk_size=50, overlap_size=20)
+        self.chunker = DocumentChunker(self.config)
+    
+    def test_chunk_indices_are_consecutive_integers(self):
+        """Test that text, table and image chunks get consecutive integer indices."""
+        content = {
+            'text': "This is a sentence about invoices. " * 40,
+            'tables': [{'content': 'a | b'}],
+            'images': [{'content': 'logo'}]
+        }
+        
+        chunks = self.chunker.chunk_content(content, 'doc')
+        
+        indices = [chunk['chunk_index'] for chunk in chunks]
+        self.assertEqual(indices, list(range(len(chunks))))
+        self.assertTrue(all(isinstance(index, int) for index in indices))
+        self.assertEqual([chunk['content_type'] for chunk in chunks[-2:]], ['table', 'image'])
+    
+    def test_split_large_chunk_uses_integer_indices(self):
+        """Test that sub-chunks of a large chunk keep integer, ordered indices."""
+        chunk = {
+            'chunk_id': 'doc_chunk_002',
+            'chunk_index': 2,
+            'content': "Short sentence here. " * 100,
+            'content_type': 'text',
+            'metadata': {'chunk_type': 'text'}
+        }
+        
+        sub_chunks = self.chunker._split_large_chunk(chunk, 'doc')
+        
+        self.assertGreater(len(sub_chunks), 10)
+        indices = [sub_chunk['chunk_index'] for sub_chunk in sub_chunks]
+        self.assertEqual(indices, sorted(indices))
+        self.assertEqual(len(set(indices)), len(indices))
+        self.assertTrue(all(isinstance(index, int) for index in indices))
+        self.assertTrue(all(len(sub_chunk['content']) <= self.config.max_chunk_size for sub_chunk in sub_chunks))
+    
+    def test_oversized_chunk_is_not_duplicated(self):
+        """Test that an oversized chunk is replaced by its sub-chunks."""
+        text = "Another plain sentence. " * 50
+        
+        chunks = self.chunker.chunk_content({'text': text}, 'doc')
+        
+        self.assertTrue(all(len(chunk['content']) <= self.config.max_chunk_size for chunk in chunks))
+        self.assertEqual(sum(chunk['content'].count('Another') for chunk in chunks), 50)
+    
+    def test_extract_chunk_metadata(self):
+        """Test metadata extraction of dates, numbers and entities."""
+        text = ("Invoice 2023-01-05 total $1,250.00 for John Smith, contact john@acme.com "
+                "or https://acme.com or 555-123-4567.")
+        
+        metadata = self.chunker._extract_chunk_metadata(text, 0)
+        
+        self.assertEqual(metadata['dates'], ['2023-01-05'])
+        self.assertEqual(metadata['numbers'], ['$1,250.00'])
+        self.assertEqual(metadata['entities']['emails'], ['john@acme.com'])
+        self.assertEqual(metadata['entities']['urls'], ['https://acme.com'])
+        self.assertEqual(metadata['entities']['phones'], ['555-123-4567'])
+        self.assertEqual(metadata['entities']['names'], ['John Smith'])
+    
+    def test_metadata_digits_are_ascii_only(self):
+        """Test that non-ASCII digits are not numbers, matching the re2 backend."""
+        metadata = self.chunker._extract_chunk_metadata("Order ١٢٣ and 456", 0)
+
+        self.assertEqual(metadata['numbers'], ['456'])
+
+    def test_word_count_matches_split(self):
+        """Test word_count on single-space and irregular whitespace."""
+        for text in ("", "one", "one two three", "one  two\nthree\tfour", " lead", "a\xa0b"):
+            metadata = self.chunker._extract_chunk_metadata(text, 0)
+            self.assertEqual(metadata['word_count'], len(text.split()), repr(text))
+    
+    def test_chunk_content_batched(self):
+        """Test that batched output covers every chunk in order."""
+        content = {'text': "Batch me please. " * 100, 'tables': [{'content': 'x'}]}
+        
+        chunks = self.chunker.chunk_content(content, 'doc')
+        batches = list(self.chunker.chunk_content_batched(content, 'doc', batch_size=3))
+        
+        self.assertTrue(all(len(batch) <= 3 for batch in batches))
+        self.assertEqual([c['chunk_id'] for batch in batches for c in batch], [c['chunk_id'] for c in chunks])
+
+
+class TestChunkConfig(unittest.TestCase):
+    """Test cases for ChunkConfig class."""
+    
+    def test_explicit_sizes_are_kept(self):
+        """Test that sizes within max_chunk_bytes are not changed."""
+        config = ChunkConfig(max_chunk_size=4096, min_chunk_size=100)
+        
+        self.assertEqual(config.max_chunk_size, 4096)
+    
+    def test_max_chunk_size_is_clamped_to_max_chunk_bytes(self):
+        """Test that a max_chunk_size over max_chunk_bytes // 4 is lowered with a warning."""
+        with self.assertLogs('document_processor.chunker', level='WARNING'):
+            config = ChunkConfig(max_chunk_size=5000)
+        
+        self.assertEqual(config.max_chunk_size, 4096)
+    
+    def test_max_chunk_size_must_not_be_below_min(self):
+        """Test that inconsistent size limits are rejected, also after clamping."""
+        with self.assertRaises(ValueError):
+            ChunkConfig(max_chunk_size=100, min_chunk_size=200)
+        with self.assertRaises(ValueError):
+            ChunkConfig(max_chunk_bytes=400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Tests for the metadata extractor module.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from django.core.cache import cache
+from document_processor.extractor import MetadataExtractor
+
+
+class TestMetadataExtractor(unittest.TestCase):
+    """Test cases for MetadataExtractor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.extractor = MetadataExtractor()
+        cache.clear()
+
+    def test_detect_language_indicators(self):
+        """Test that common words drive language detection."""
+        result = self.extractor._detect_language_indicators(
+            "the cat and the dog went to the park with a ball"
+        )
+
+        self.assertEqual(result['primary_language'], 'en')
+        self.assertAlmostEqual(result['confidence'], 0.5)
+
+    def test_detect_document_type(self):
+        """Test document type scoring by distinct keywords."""
+        result = self.extractor._detect_document_type("i want a refund, please cancel the order")
+
+        self.assertEqual(result['likely_types'], ['refund_case'])
+        self.assertAlmostEqual(result['confidence_scores']['refund_case'], 0.4)
+        self.assertEqual(result['confidence_scores']['invoice'], 0.0)
+
+    def test_detect_document_type_matches_inflected_words(self):
+        """Test that keywords match inside plural and inflected words."""
+        result = self.extractor._detect_document_type(
+            "we refunded the payments and cancelled the tickets; billing problems "
+            "and issues remain. returned items."
+        )
+
+        self.assertEqual(result['likely_types'], ['refund_case', 'support_case', 'invoice'])
+        self.assertAlmostEqual(result['confidence_scores']['refund_case'], 3 / 5)
+        self.assertAlmostEqual(result['confidence_scores']['support_case'], 3 / 7)
+        self.assertAlmostEqual(result['confidence_scores']['invoice'], 2 / 7)
+
+    def test_detect_document_type_counts_overlapping_keywords(self):
+        """Test that a phrase and the keyword inside it are both counted."""
+        result = self.extractor._detect_document_type("invoice number 42")
+
+        self.assertAlmostEqual(result['confidence_scores']['invoice'], 2 / 7)
+
+    def test_content_density_counts_unicode_whitespace(self):
+        """Test that information density matches a per-character str.isspace() count."""
+        text = "Total:\t$10\u00a0due\n\nPaid.\u2003Thanks. "
+
+        density = self.extractor._analyze_content_density(text)
+
+        non_whitespace = sum(1 for c in text if not c.isspace())
+        self.assertAlmostEqual(density['information_density'], non_whitespace / len(text))
+        self.assertEqual(density['readability_indicators']['sentence_count'], 2)
+        self.assertEqual(density['readability_indicators']['paragraph_count'], 2)
+
+    def test_extract_key_topics(self):
+        """Test that repeated non-stop words become topics, most frequent first."""
+        topics = self.extractor._extract_key_topics(
+            "refund the order. the order was late, so the refund (refund!) should be quick. "
+            "these would help."
+        )
+
+        self.assertEqual(topics, ['refund', 'order'])
+
+    def test_extract_important_entities(self):
+        """Test pattern entities are capped per label and reported email, phone, money."""
+        text = " ".join(f"$ {i}" for i in range(10)) + " a@b.com 555-123-4567 c@d.org"
+        langextract_result = {'extracted_data': {'entities': [{'text': 'ACME', 'label': 'ORG'}]}}
+
+        entities = self.extractor._extract_important_entities(text, langextract_result)
+
+        self.assertEqual([e['label'] for e in entities],
+                         ['ORG', 'EMAIL', 'EMAIL', 'PHONE'] + ['MONEY'] * 5)
+        self.assertEqual(entities[1]['text'], 'a@b.com')
+        self.assertEqual(entities[3]['confidence'], 0.8)
+        self.assertEqual(entities[-1]['text'], '$ 4')
+
+    def test_identify_document_sections(self):
+        """Test that short title-case or upper-case lines start sections."""
+        text = ("INTRODUCTION\nThis document explains the refund policy in detail.\n"
+                "Not A Header.\nPayment Terms\nInvoices are due within thirty days.")
+
+        sections = self.extractor._identify_document_sections(text)
+
+        self.assertEqual([s['title'] for s in sections], ['INTRODUCTION', 'Payment Terms'])
+        self.assertEqual((sections[0]['start_line'], sections[0]['end_line']), (0, 2))
+        self.assertEqual(sections[1]['content_preview'], 'Invoices are due within thirty days.')
+
+    def test_extract_action_items(self):
+        """Test action item extraction."""
+        items = self.extractor._extract_action_items("Please send the file. Deadline tomorrow.")
+
+        self.assertEqual([item['text'] for item in items], ['send the file.', 'tomorrow.'])
+
+    def test_extract_action_items_finds_overlapping_phrases(self):
+        """Test that phrases inside a phrase of another kind are still found."""
+        items = self.extractor._extract_action_items(
+            "Please pay the invoice by Friday. Next step: we must call the vendor."
+        )
+
+        self.assertEqual([item['text'] for item in items], [
+            'pay the invoice by Friday.', 'call the vendor.', 'we must call the vendor.', 'Friday.'
+        ])
+
+    def test_extract_metadata_is_cached_by_content(self):
+        """Test that identical text and schemas reuse the cached result."""
+        result = {'extracted_data': {'entities': []}}
+        with patch.object(self.extractor, '_run_schema_extraction', return_value=result) as mock_run:
+            first = asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['invoice']))
+            second = asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['invoice']))
+            asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['refund_case']))
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(first['langextract_result'], second['langextract_result'])
+
+    def test_extract_metadata_does_not_cache_errors(self):
+        """Test that failed schema extractions are retried."""
+        with patch.object(self.extractor, '_run_schema_extraction',
+                          return_value={'error': 'timeout'}) as mock_run:
+            asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['invoice']))
+            asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['invoice']))
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    def test_extract_metadata_without_cache(self):
+        """Test that cache errors do not fail the extraction."""
+        result = {'extracted_data': {'entities': []}}
+        with patch.object(cache, 'get', side_effect=ConnectionError("redis down")), \
+                patch.object(cache, 'set', side_effect=ConnectionError("redis down")), \
+                patch.object(self.extractor, '_run_schema_extraction', return_value=result):
+            metadata = asyncio.run(self.extractor.extract_metadata("Invoice total $10", ['invoice']))
+
+        self.assertNotIn('error', metadata)
+        self.assertEqual(metadata['processing_metadata']['word_count'], 3)
+
+    def test_extract_metadata_batch_deduplicates_texts(self):
+        """Test that batch extraction keeps order and extracts repeated texts once."""
+        result = {'extracted_data': {'entities': []}}
+        texts = ["Invoice total $10", "Refund please", "Invoice total $10"]
+        with patch.object(self.extractor, '_run_schema_extraction', return_value=result) as mock_run:
+            results = asyncio.run(self.extractor.extract_metadata_batch(texts, ['invoice']))
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(len(results), 3)
+        self.assertIs(results[0], results[2])
+        self.assertEqual(results[1]['processing_metadata']['word_count'], 2)
+
+    def test_extract_metadata_batch_limits_concurrency(self):
+        """Test that batch extraction runs at most max_concurrency extractions at once."""
+        running = []
+        peak = []
+
+        async def extract(text, schemas=None):
+            running.append(text)
+            peak.append(len(running))
+            await asyncio.sleep(0)
+            running.remove(text)
+            return {'text': text}
+
+        with patch.object(self.extractor, 'extract_metadata', side_effect=extract):
+            results = asyncio.run(self.extractor.extract_metadata_batch(
+                ['a', 'b', 'c', 'd', 'e'], max_concurrency=2
+            ))
+
+        self.assertEqual([r['text'] for r in results], ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(max(peak), 2)
+
+    def test_extract_metadata_on_pool_matches_inline(self):
+        """Test that the thread-pool path returns the same analysis as the inline path."""
+        text = "INTRO\nPlease pay $5 to a@b.com. The total is due."
+        inline = asyncio.run(MetadataExtractor()._enhance_metadata({}, text))
+        pooled = asyncio.run(MetadataExtractor(inline_threshold=0)._enhance_metadata({}, text))
+
+        self.assertEqual(inline['text_analysis'], pooled['text_analysis'])
+        self.assertEqual(inline['content_insights'], pooled['content_insights'])
+
+
+if __name__ == '__main__':
+    unittest.main()
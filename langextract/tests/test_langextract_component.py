@@ -0,0 +1,223 @@
+"""
+Tests for the LangExtract Langflow component.
+"""
+
+import gzip
+import json
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+try:
+    import httpx
+    import langextract_component_fixed as component_module
+    from langextract_component_fixed import LangExtractComponent, DocumentChunk, _encode_body
+except ImportError:  # langflow and httpx are only installed alongside Langflow
+    component_module = LangExtractComponent = _encode_body = None
+
+
+def _batch_response(doc_ids, stored_ids, failed=0, processing_time=0.5):
+    return {
+        'status': 'success',
+        'processed_documents': [{'chunk_id': doc_id} for doc_id in doc_ids],
+        'summary': {
+            'total_chunks': len(doc_ids),
+            'processed_chunks': len(doc_ids),
+            'failed_chunks': 0,
+            'total_processing_time': processing_time,
+            'storage_results': {
+                'successful': len(stored_ids),
+                'failed': failed,
+                'stored_ids': stored_ids,
+            },
+        },
+    }
+
+
+@unittest.skipIf(LangExtractComponent is None, "langflow is not installed")
+class TestMergeResults(unittest.TestCase):
+    """Test cases for LangExtractComponent._merge_results."""
+
+    def test_merges_server_storage_results(self):
+        """Test that counts are summed and stored_ids concatenated across batches."""
+        merged = LangExtractComponent._merge_results([
+            _batch_response(['a', 'b'], ['e1', 'e2'], processing_time=0.1234),
+            _batch_response(['c'], [], failed=1, processing_time=0.2),
+        ])
+
+        self.assertEqual(merged['status'], 'success')
+        self.assertEqual([d['chunk_id'] for d in merged['processed_documents']], ['a', 'b', 'c'])
+        summary = merged['summary']
+        self.assertEqual(summary['total_chunks'], 3)
+        self.assertEqual(summary['processed_chunks'], 3)
+        self.assertEqual(summary['total_processing_time'], 0.323)
+        self.assertEqual(summary['storage_results'],
+                         {'successful': 2, 'failed': 1, 'stored_ids': ['e1', 'e2']})
+
+    def test_single_batch_has_same_shape(self):
+        """Test that one batch goes through the merge and keeps the server's shape."""
+        response = _batch_response(['a'], ['e1'])
+
+        merged = LangExtractComponent._merge_results([response])
+
+        self.assertEqual(merged, response)
+        self.assertIsNot(merged['processed_documents'], response['processed_documents'])
+
+    def test_error_status_from_any_batch(self):
+        """Test that a failed storage batch marks the merged storage results failed."""
+        failed = _batch_response(['b'], [])
+        failed['summary']['storage_results'] = {'status': 'error', 'error': 'boom', 'stored': 0, 'failed': 1}
+
+        merged = LangExtractComponent._merge_results([_batch_response(['a'], ['e1']), failed])
+
+        storage = merged['summary']['storage_results']
+        self.assertEqual(storage['status'], 'error')
+        self.assertEqual(storage['error'], 'boom')
+        self.assertEqual((storage['successful'], storage['failed']), (1, 1))
+
+
+@unittest.skipIf(LangExtractComponent is None, "langflow is not installed")
+class TestExtractAll(unittest.TestCase):
+    """Test cases for LangExtractComponent._extract_all."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.component = LangExtractComponent()
+
+    def test_dict_chunk(self):
+        """Test that dict chunks use the first non-empty candidate key."""
+        chunk = {'content': '', 'page_content': 'body', 'doc_id': 'd1', 'chunk_index': 4, 'page': None}
+
+        self.assertEqual(self.component._extract_all(chunk, 0),
+                         ('body', 'd1', '4', {'doc_id': 'd1', 'chunk_index': 4}))
+
+    def test_object_chunk(self):
+        """Test that an existing attribute wins even when it is None."""
+        chunk = SimpleNamespace(text='hello', document_id=None, _private=1)
+
+        self.assertEqual(self.component._extract_all(chunk, 7),
+                         ('hello', 'None', 'chunk_007', {'text': 'hello'}))
+
+    def test_plain_chunk(self):
+        """Test that chunks without fields fall back to their string form and defaults."""
+        self.assertEqual(self.component._extract_all(42, 1),
+                         ('42', 'default_document', 'chunk_001', {}))
+
+
+def _mock_client(handler):
+    return {
+        'session': httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        'base_url': 'http://langextract.test',
+        'timeout': 5,
+        'compress': False,
+    }
+
+
+@unittest.skipIf(LangExtractComponent is None, "langflow is not installed")
+class TestPostBatch(unittest.TestCase):
+    """Test cases for sending batches to /api/process/."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.component = LangExtractComponent()
+        self.requests = []
+
+    def _post(self, *statuses):
+        def handler(request):
+            self.requests.append(request)
+            status, headers = statuses[len(self.requests) - 1]
+            return httpx.Response(status, headers=headers, json={'status': 'success'})
+
+        client = _mock_client(handler)
+        return asyncio.run(self.component._post_batch(client, 'http://langextract.test/api/process/', {}))
+
+    def test_server_errors_are_not_resent(self):
+        """Test that a 5xx is raised instead of possibly storing the batch twice."""
+        for status in (500, 502, 503, 504):
+            self.requests.clear()
+            with self.assertRaises(httpx.HTTPStatusError):
+                self._post((status, {}))
+            self.assertEqual(len(self.requests), 1)
+
+    def test_unprocessed_batches_are_resent(self):
+        """Test that 429 and 503 with Retry-After are resent."""
+        result = self._post((429, {}), (503, {'Retry-After': '0'}), (200, {}))
+
+        self.assertEqual(result, {'status': 'success'})
+        self.assertEqual(len(self.requests), 3)
+
+    @patch.object(component_module, 'BATCH_SIZE', 1)
+    def test_failed_batch_cancels_the_rest(self):
+        """Test that batches still being sent are cancelled when one fails."""
+        cancelled = []
+
+        async def handler(request):
+            if json.loads(request.content)['documents'][0]['chunk_id'] == 'bad':
+                return httpx.Response(500)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(request)
+                raise
+            return httpx.Response(200, json={})
+
+        async def process():
+            documents = [DocumentChunk(text='t', document_id='d', chunk_id=chunk_id)
+                         for chunk_id in ('slow', 'bad')]
+            with self.assertRaises(RuntimeError):
+                await self.component._process_documents(_mock_client(handler), documents, ['invoice'], None)
+            # Checked before asyncio.run cancels leftover tasks itself
+            self.assertEqual(len(cancelled), 1)
+
+        asyncio.run(asyncio.wait_for(process(), 5))
+
+
+    def test_run_closes_its_client(self):
+        """Test that each run's HTTP client is closed when the run ends."""
+        inputs = {
+            'dokling_chunks': [{'text': 'hello'}], 'schemas': 'invoice', 'extract_entities': True,
+            'extract_categories': True, 'confidence_threshold': 0.7, 'timeout': 30,
+            'api_url': 'http://langextract.test', 'compress_requests': False,
+        }
+        for name, value in inputs.items():
+            setattr(self.component, name, value)
+        clients = []
+
+        async def process(client, *args):
+            clients.append(client['session'])
+            self.assertFalse(client['session'].is_closed)
+            return {'status': 'success'}
+
+        with patch.object(self.component, '_process_documents', process):
+            asyncio.run(self.component.process_chunks())
+
+        self.assertTrue(clients[0].is_closed)
+
+
+@unittest.skipIf(_encode_body is None, "langflow is not installed")
+class TestEncodeBody(unittest.TestCase):
+    """Test cases for request body encoding."""
+
+    def test_compression_is_opt_in(self):
+        """Test that large bodies are only gzipped when compression is requested."""
+        payload = {'documents': [{'text': 'x' * 5000}]}
+
+        plain, plain_headers = _encode_body(payload)
+        compressed, headers = _encode_body(payload, compress=True)
+
+        self.assertNotIn('Content-Encoding', plain_headers)
+        self.assertEqual(json.loads(plain), payload)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed)), payload)
+
+    def test_small_bodies_are_not_compressed(self):
+        """Test that small bodies are sent as-is even with compression on."""
+        body, headers = _encode_body({'a': 1}, compress=True)
+
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(json.loads(body), {'a': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Tests for the core middleware module.
+"""
+
+import gzip
+import json
+import unittest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from core.middleware import GzipRequestMiddleware
+
+
+class TestGzipRequestMiddleware(unittest.TestCase):
+    """Test cases for GzipRequestMiddleware class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.factory = RequestFactory()
+        self.seen = {}
+        self.middleware = GzipRequestMiddleware(self._view)
+
+    def _view(self, request):
+        self.seen['body'] = request.body
+        self.seen['content_length'] = request.META.get('CONTENT_LENGTH')
+        self.seen['encoding'] = request.META.get('HTTP_CONTENT_ENCODING')
+        return HttpResponse('ok')
+
+    def _post(self, data, **extra):
+        return self.factory.post('/api/process/', data=data,
+                                 content_type='application/json', **extra)
+
+    def test_decompresses_gzip_body(self):
+        """Test that a gzip body reaches the view decompressed."""
+        payload = json.dumps({'documents': [{'text': 'hello ' * 100}]}).encode()
+        request = self._post(gzip.compress(payload, compresslevel=1), HTTP_CONTENT_ENCODING='gzip')
+
+        response = self.middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.seen['body'], payload)
+        self.assertEqual(self.seen['content_length'], str(len(payload)))
+        self.assertIsNone(self.seen['encoding'])
+
+    def test_passes_plain_body_through(self):
+        """Test that bodies without Content-Encoding are left alone."""
+        response = self.middleware(self._post(b'{"a": 1}'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.seen['body'], b'{"a": 1}')
+
+    def test_rejects_invalid_gzip(self):
+        """Test that corrupt or truncated gzip bodies get a 400."""
+        compressed = gzip.compress(b'{"a": 1}')
+        for body in (b'not gzip', compressed[:-10]):
+            response = self.middleware(self._post(body, HTTP_CONTENT_ENCODING='gzip'))
+            self.assertEqual(response.status_code, 400)
+        self.assertNotIn('body', self.seen)
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1000)
+    def test_rejects_oversized_decompressed_body(self):
+        """Test that the upload size limit applies to the decompressed body."""
+        request = self._post(gzip.compress(b' ' * 5000), HTTP_CONTENT_ENCODING='gzip')
+
+        response = self.middleware(request)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertNotIn('body', self.seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the OpenAI client module.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import openai
+from core.openai_client import OpenAIClient
+
+
+def _create_embeddings(model, input):
+    """Embedding.create stub that rejects any request containing a 'bad' text."""
+    if 'bad' in input:
+        raise openai.error.InvalidRequestError("input rejected", "input")
+    return {'data': [{'index': i, 'embedding': [float(len(text))]} for i, text in enumerate(input)]}
+
+
+class TestGenerateEmbeddingsBatch(unittest.TestCase):
+    """Test cases for OpenAIClient.generate_embeddings_batch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = OpenAIClient()
+        self.client.client = MagicMock()
+        self.client.client.Embedding.create.side_effect = _create_embeddings
+        self.client.rate_limit_delay = 0
+
+    def test_rejected_input_only_loses_itself(self):
+        """Test that a rejected text gets None while the rest of its batch is embedded."""
+        texts = ['a', 'bb', 'bad', 'cccc', 'ddddd']
+
+        embeddings = self.client.generate_embeddings_batch(texts)
+
+        self.assertEqual(embeddings, [[1.0], [2.0], None, [4.0], [5.0]])
+
+    def test_other_errors_fail_the_batch_without_splitting(self):
+        """Test that connection errors are not retried text by text."""
+        self.client.client.Embedding.create.side_effect = openai.error.APIConnectionError("down")
+
+        embeddings = self.client.generate_embeddings_batch(['a', 'b', 'c'])
+
+        self.assertEqual(embeddings, [None, None, None])
+        self.assertEqual(self.client.client.Embedding.create.call_count, 1)
+
+    def test_request_errors_fail_the_batch_without_splitting(self):
+        """Test that a rejected request not caused by an input is not split."""
+        self.client.client.Embedding.create.side_effect = openai.error.InvalidRequestError(
+            "model not found", "model"
+        )
+
+        embeddings = self.client.generate_embeddings_batch(['a', 'b', 'c', 'd'])
+
+        self.assertEqual(embeddings, [None, None, None, None])
+        self.assertEqual(self.client.client.Embedding.create.call_count, 1)
+
+    def test_context_length_error_splits_the_batch(self):
+        """Test that a context-length rejection is treated as an input error."""
+        def create(model, input):
+            if 'long' in input:
+                raise openai.error.InvalidRequestError(
+                    "too many tokens", None, code='context_length_exceeded'
+                )
+            return _create_embeddings(model, input)
+        self.client.client.Embedding.create.side_effect = create
+
+        embeddings = self.client.generate_embeddings_batch(['a', 'long', 'ccc'])
+
+        self.assertEqual(embeddings, [[1.0], None, [3.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
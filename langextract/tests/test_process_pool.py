@@ -0,0 +1,51 @@
+"""
+Tests for the worker process pools.
+"""
+
+import os
+import asyncio
+import atexit
+import unittest
+from unittest.mock import patch
+from concurrent.futures.process import BrokenProcessPool
+from document_processor.process_pool import WorkerPool
+
+
+def _exit_worker(*args):
+    """Kill the worker process, breaking its pool."""
+    os._exit(1)
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test cases for WorkerPool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.pool = WorkerPool('Test', max_workers=1)
+
+    def test_run(self):
+        """Test that work runs in a worker process."""
+        self.assertNotEqual(asyncio.run(self.pool.run(os.getpid)), os.getpid())
+
+    def test_pool_is_replaced_after_worker_dies(self):
+        """Test that a dead worker fails its call once, without a retry, and later calls use a new pool."""
+        with self.assertRaises(BrokenProcessPool):
+            asyncio.run(self.pool.run(_exit_worker))
+
+        self.assertIsNone(self.pool._executor)
+        self.assertEqual(asyncio.run(self.pool.run(len, 'abc')), 3)
+
+    def test_exit_handler_is_registered_once(self):
+        """Test that replacing the pool does not register another exit handler."""
+        with patch.object(atexit, 'register') as register:
+            pool = WorkerPool('Test', max_workers=1)
+            with self.assertRaises(BrokenProcessPool):
+                asyncio.run(pool.run(_exit_worker))
+            asyncio.run(pool.run(len, 'abc'))
+            pool._shutdown()
+
+        register.assert_called_once_with(pool._shutdown)
+
+
+if __name__ == '__main__':
+    unittest.main()
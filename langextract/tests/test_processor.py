@@ -0,0 +1,169 @@
+"""
+Tests for the document processor module.
+"""
+
+import os
+import asyncio
+import hashlib
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+from postgrest.exceptions import APIError
+from django.core.cache import cache
+from document_processor import processor
+from document_processor.processor import DocumentProcessor
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestStoreFile(unittest.TestCase):
+    """Test cases for storing uploads from async byte streams."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+        self.processor = DocumentProcessor(upload_dir=upload_dir.name, max_file_size=10)
+
+    @patch.object(processor, 'STREAM_WRITE_BUFFER_BYTES', 4)
+    def test_stream_is_written_off_the_event_loop(self):
+        """Test that buffered stream chunks are hashed and written in threads."""
+        threads = []
+        append_chunks = processor._append_chunks
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            append_chunks(*args)
+
+        file_info = {}
+        with patch.object(processor, '_append_chunks', record_thread), \
+                patch.object(processor, '_content_hasher', lambda: hashlib.blake2b(digest_size=16)):
+            path = asyncio.run(self.processor._store_file(_stream(b'ab', b'cd', b'ef'), 'a.txt', 'id', file_info))
+
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'abcdef')
+        self.assertEqual(file_info['file_size'], 6)
+        self.assertEqual(file_info['content_hash'], hashlib.blake2b(b'abcdef', digest_size=16).hexdigest())
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_oversized_stream_is_removed(self):
+        """Test that a stream over max_file_size raises and leaves no file."""
+        with self.assertRaises(ValueError):
+            asyncio.run(self.processor._store_file(_stream(b'x' * 6, b'x' * 6), 'a.txt', 'id', {}))
+
+        self.assertEqual(os.listdir(self.processor.upload_dir), [])
+
+
+class TestExecuteWithRetry(unittest.TestCase):
+    """Test cases for retrying Supabase requests."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.processor = DocumentProcessor()
+
+    def _attempts(self, error, idempotent=True):
+        query = MagicMock()
+        query.execute.side_effect = error
+        with patch.object(processor.asyncio, 'sleep', AsyncMock()):
+            with self.assertRaises(type(error)):
+                asyncio.run(self.processor._execute_with_retry(query, 'test', idempotent=idempotent))
+        return query.execute.call_count
+
+    def test_transient_errors_are_retried(self):
+        """Test that unreachable database and connection errors are retried."""
+        for error in (APIError({'code': 'PGRST000'}), APIError({'code': '40P01'}),
+                      APIError({'code': 503}), httpx.ConnectError('refused'), httpx.ReadTimeout('slow')):
+            self.assertEqual(self._attempts(error), processor.STORAGE_MAX_ATTEMPTS, error)
+
+    def test_request_errors_are_not_retried(self):
+        """Test that constraint and type errors are raised at once."""
+        for error in (APIError({'code': '23505'}), APIError({'code': '22P02'}), ValueError('bad')):
+            self.assertEqual(self._attempts(error), 1, error)
+
+    def test_inserts_are_not_retried_after_being_sent(self):
+        """Test that an insert is only resent when it certainly was not applied."""
+        self.assertEqual(self._attempts(httpx.ReadTimeout('slow'), idempotent=False), 1)
+        self.assertEqual(self._attempts(APIError({'code': 504}), idempotent=False), 1)
+        self.assertEqual(self._attempts(httpx.ConnectError('refused'), idempotent=False),
+                         processor.STORAGE_MAX_ATTEMPTS)
+
+
+class TestCacheOutage(unittest.TestCase):
+    """Test cases for processing while the cache backend is failing."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.processor = DocumentProcessor()
+        self.outage = [
+            patch.object(cache, name, side_effect=ConnectionError("redis down"))
+            for name in ('get', 'set', 'get_many', 'set_many')
+        ]
+        for patcher in self.outage:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_extract_content_without_cache(self):
+        """Test that converted content is returned instead of the fallback text."""
+        async def convert(file_path):
+            return {'text': 'converted'}
+
+        with patch.object(processor, 'DOCLING_AVAILABLE', True), \
+                patch.object(processor, '_run_docling_conversion', convert):
+            content = asyncio.run(self.processor._extract_content('a.pdf', 'pdf', content_hash='abc'))
+
+        self.assertEqual(content, {'text': 'converted'})
+
+    def test_embeddings_without_cache(self):
+        """Test that generated embeddings are kept."""
+        vector = [0.1] * 1536
+        with patch.object(processor.openai_client, 'is_available', return_value=True), \
+                patch.object(processor.openai_client, 'generate_embeddings_batch',
+                             return_value=[vector, vector]):
+            embeddings = asyncio.run(self.processor._generate_embeddings_batch(['a', 'b']))
+
+        self.assertEqual(embeddings, [{'text': vector}, {'text': vector}])
+
+
+class TestDocumentListCache(unittest.TestCase):
+    """Test cases for the cached document list."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        cache.clear()
+        self.processor = DocumentProcessor()
+        self.client = MagicMock()
+        self.listing = self.client.table.return_value.select.return_value.order.return_value.range.return_value
+        self.listing.execute.return_value = SimpleNamespace(data=[{'id': 'a'}])
+        for name, value in (('is_available', True), ('get_client', self.client)):
+            patcher = patch.object(processor.supabase_client, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_list_is_cached(self):
+        """Test that repeated list requests are served from the cache."""
+        asyncio.run(self.processor.list_documents())
+        documents = asyncio.run(self.processor.list_documents())
+
+        self.assertEqual(documents, [{'id': 'a'}])
+        self.assertEqual(self.listing.execute.call_count, 1)
+
+    def test_changes_invalidate_lists(self):
+        """Test that deletes and status updates are visible in the next list."""
+        asyncio.run(self.processor.list_documents())
+        asyncio.run(self.processor.delete_document('a'))
+        asyncio.run(self.processor.list_documents())
+        asyncio.run(self.processor._update_document_status('b', 'completed'))
+        asyncio.run(self.processor.list_documents())
+
+        self.assertEqual(self.listing.execute.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,7 +61,7 @@ async def update_document_metadata():
             'content_type': chunk.get('content_type', 'text'),
             'chunk_metadata': chunk.get('chunk_metadata', {}),
             'extracted_metadata': chunk.get('extracted_metadata', {}),
-            'embeddings': chunk.get('all_embeddings', {}),
+            'embeddings': chunk.get('all_embeddings') or {},
             'created_at': chunk.get('created_at', '')
         }
         processed_chunks.append(processed_chunk)